@@ -48,11 +48,24 @@ __version__ = "1.2.0"
 import os
 import re
 import sys
+import array
 import imath
+import fnmatch
 import ctypes
 import weakref
 import alembic
 from functools import wraps
+from collections import OrderedDict
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import imathnumpy
+except ImportError:
+    imathnumpy = None
 
 _string_types = (type(u""), type(b""))
 
@@ -173,6 +186,86 @@ class Uint64(DataType):
         super(Uint64, self).__init__(n, ctypes.c_uint64)
 
 
+class TypedArray(object):
+    """Base class for typed array classes. Used to write a whole array of
+    values with a specific data type, without creating a DataType object
+    per value. Should use one of the subclasses, e.g. if prop is a cask
+    Property,
+
+    ::
+
+        prop.set_value(cask.Uint16Array(values))
+
+    should write out the values as a uint16_t array in the archive. Values
+    can be any sequence of numbers, an array.array, a NumPy array or a
+    bytes-like buffer of raw values, and must fit in the data type.
+    """
+    dtype = None
+
+    def __init__(self, values):
+        if isinstance(values, TypedArray):
+            values = values.values
+        if numpy is not None and isinstance(values, numpy.ndarray):
+            if not _fits_dtype(values, numpy.dtype(self.dtype)):
+                raise OverflowError("values do not fit in %s" % self.dtype)
+            self.values = values.astype(self.dtype, copy=False).reshape(-1)
+            return
+        self.values = array.array(TYPECODES_BY_DTYPE[self.dtype])
+        if isinstance(values, (bytes, bytearray, memoryview)) \
+                and not isinstance(values, str):
+            data = memoryview(values).tobytes()
+            if hasattr(self.values, "frombytes"):
+                self.values.frombytes(data)
+            else:
+                self.values.fromstring(data)
+        else:
+            self.values.extend(values)
+
+    def __repr__(self):
+        return '<%s %d values>' % (self.__class__.__name__, len(self))
+
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __getitem__(self, index):
+        return self.values[index]
+
+
+class Int8Array(TypedArray):
+    dtype = "int8"
+
+
+class Int16Array(TypedArray):
+    dtype = "int16"
+
+
+class Int32Array(TypedArray):
+    dtype = "int32"
+
+
+class Int64Array(TypedArray):
+    dtype = "int64"
+
+
+class Uint8Array(TypedArray):
+    dtype = "uint8"
+
+
+class Uint16Array(TypedArray):
+    dtype = "uint16"
+
+
+class Uint32Array(TypedArray):
+    dtype = "uint32"
+
+
+class Uint64Array(TypedArray):
+    dtype = "uint64"
+
+
 # Type functions are deprecated and will be removed in next release
 def int8(n):
     return Int8(n).value()
@@ -206,6 +299,12 @@ def uint64(n):
     return Uint64(n).value()
 
 
+# Imath arrays for 64-bit integers, or None if the imath binding does not
+# provide them, in which case 64-bit arrays can not be written
+IMATH_INT64_ARRAY = getattr(imath, "Int64Array", None)
+IMATH_UINT64_ARRAY = getattr(imath, "UInt64Array",
+                             getattr(imath, "Uint64Array", None))
+
 # Python class mapping to Imath array class
 IMATH_ARRAYS_BY_TYPE = {
     bool: imath.BoolArray,
@@ -243,12 +342,21 @@ IMATH_ARRAYS_BY_TYPE = {
     Int8: imath.SignedCharArray,
     Int16: imath.ShortArray,
     Int32: imath.IntArray,
-    Int64: imath.DoubleArray,
+    Int64: IMATH_INT64_ARRAY,
     Uint8: imath.UnsignedCharArray,
     Uint16: imath.UnsignedShortArray,
-    Uint32: imath.UnsignedIntArray
+    Uint32: imath.UnsignedIntArray,
+    Uint64: IMATH_UINT64_ARRAY,
+    Int8Array: imath.SignedCharArray,
+    Int16Array: imath.ShortArray,
+    Int32Array: imath.IntArray,
+    Int64Array: IMATH_INT64_ARRAY,
+    Uint8Array: imath.UnsignedCharArray,
+    Uint16Array: imath.UnsignedShortArray,
+    Uint32Array: imath.UnsignedIntArray,
+    Uint64Array: IMATH_UINT64_ARRAY,
 }
-IMATH_ARRAYS_VALUES = set(IMATH_ARRAYS_BY_TYPE.values())
+IMATH_ARRAYS_VALUES = set(IMATH_ARRAYS_BY_TYPE.values()) - set([None])
 
 # Python class mapping to Alembic POD, extent
 POD_EXTENT = {
@@ -262,6 +370,14 @@ POD_EXTENT = {
     Int32: (alembic.Util.POD.kInt32POD, -1),
     Uint64: (alembic.Util.POD.kUint64POD, -1),
     Int64: (alembic.Util.POD.kInt64POD, -1),
+    Int8Array: (alembic.Util.POD.kInt8POD, 1),
+    Int16Array: (alembic.Util.POD.kInt16POD, 1),
+    Int32Array: (alembic.Util.POD.kInt32POD, 1),
+    Int64Array: (alembic.Util.POD.kInt64POD, 1),
+    Uint8Array: (alembic.Util.POD.kUint8POD, 1),
+    Uint16Array: (alembic.Util.POD.kUint16POD, 1),
+    Uint32Array: (alembic.Util.POD.kUint32POD, 1),
+    Uint64Array: (alembic.Util.POD.kUint64POD, 1),
     float: (alembic.Util.POD.kFloat64POD, -1),
     str: (alembic.Util.POD.kStringPOD, -1),
     imath.V3f: (alembic.Util.POD.kFloat32POD, 3),
@@ -285,7 +401,154 @@ POD_EXTENT = {
     imath.DoubleArray: (alembic.Util.POD.kFloat64POD, -1),
 }
 
+# Alembic POD mapping to size in bytes
+POD_BYTES = {
+    alembic.Util.POD.kBooleanPOD: 1,
+    alembic.Util.POD.kUint8POD: 1,
+    alembic.Util.POD.kInt8POD: 1,
+    alembic.Util.POD.kUint16POD: 2,
+    alembic.Util.POD.kInt16POD: 2,
+    alembic.Util.POD.kUint32POD: 4,
+    alembic.Util.POD.kInt32POD: 4,
+    alembic.Util.POD.kUint64POD: 8,
+    alembic.Util.POD.kInt64POD: 8,
+    alembic.Util.POD.kFloat16POD: 2,
+    alembic.Util.POD.kFloat32POD: 4,
+    alembic.Util.POD.kFloat64POD: 8,
+}
+
+# Alembic POD mapping to NumPy dtype name
+NUMPY_DTYPES_BY_POD = {
+    alembic.Util.POD.kBooleanPOD: "bool",
+    alembic.Util.POD.kUint8POD: "uint8",
+    alembic.Util.POD.kInt8POD: "int8",
+    alembic.Util.POD.kUint16POD: "uint16",
+    alembic.Util.POD.kInt16POD: "int16",
+    alembic.Util.POD.kUint32POD: "uint32",
+    alembic.Util.POD.kInt32POD: "int32",
+    alembic.Util.POD.kUint64POD: "uint64",
+    alembic.Util.POD.kInt64POD: "int64",
+    alembic.Util.POD.kFloat16POD: "float16",
+    alembic.Util.POD.kFloat32POD: "float32",
+    alembic.Util.POD.kFloat64POD: "float64",
+    alembic.Util.POD.kStringPOD: "object",
+    alembic.Util.POD.kWstringPOD: "object",
+}
+
+# Imath class mapping to the NumPy shape of a single value or array element
+IMATH_SHAPES = {
+    imath.Box2d: (2, 2),
+    imath.Box2f: (2, 2),
+    imath.Box2i: (2, 2),
+    imath.Box2s: (2, 2),
+    imath.Box3d: (2, 3),
+    imath.Box3f: (2, 3),
+    imath.Box3i: (2, 3),
+    imath.Box3s: (2, 3),
+    imath.Color3c: (3,),
+    imath.Color3f: (3,),
+    imath.Color4c: (4,),
+    imath.Color4f: (4,),
+    imath.M33d: (3, 3),
+    imath.M33f: (3, 3),
+    imath.M44d: (4, 4),
+    imath.M44f: (4, 4),
+    imath.V2d: (2,),
+    imath.V2f: (2,),
+    imath.V2i: (2,),
+    imath.V2s: (2,),
+    imath.V3d: (3,),
+    imath.V3f: (3,),
+    imath.V3i: (3,),
+    imath.V3s: (3,),
+    imath.V4d: (4,),
+    imath.V4f: (4,),
+    imath.V4i: (4,),
+    imath.V4s: (4,),
+}
+IMATH_SHAPES.update(dict(
+    (array_class, IMATH_SHAPES.get(klass, ()))
+    for klass, array_class in IMATH_ARRAYS_BY_TYPE.items()
+    if array_class is not None
+))
+
+# NumPy dtype name and element shape mapping to Imath array class
+IMATH_ARRAYS_BY_DTYPE = {
+    ("bool", ()): imath.BoolArray,
+    ("uint8", ()): imath.UnsignedCharArray,
+    ("int8", ()): imath.SignedCharArray,
+    ("uint16", ()): imath.UnsignedShortArray,
+    ("int16", ()): imath.ShortArray,
+    ("uint32", ()): imath.UnsignedIntArray,
+    ("int32", ()): imath.IntArray,
+    ("float32", ()): imath.FloatArray,
+    ("float64", ()): imath.DoubleArray,
+    ("int64", ()): IMATH_INT64_ARRAY,
+    ("uint64", ()): IMATH_UINT64_ARRAY,
+    ("int16", (2,)): imath.V2sArray,
+    ("int32", (2,)): imath.V2iArray,
+    ("float32", (2,)): imath.V2fArray,
+    ("float64", (2,)): imath.V2dArray,
+    ("int16", (3,)): imath.V3sArray,
+    ("int32", (3,)): imath.V3iArray,
+    ("float32", (3,)): imath.V3fArray,
+    ("float64", (3,)): imath.V3dArray,
+    ("int16", (4,)): imath.V4sArray,
+    ("int32", (4,)): imath.V4iArray,
+    ("float32", (4,)): imath.V4fArray,
+    ("float64", (4,)): imath.V4dArray,
+    ("float32", (3, 3)): imath.M33fArray,
+    ("float64", (3, 3)): imath.M33dArray,
+    ("float32", (4, 4)): imath.M44fArray,
+    ("float64", (4, 4)): imath.M44dArray,
+}
+
+# NumPy dtype name mapping to Alembic POD
+POD_BY_DTYPE = dict(
+    (dtype, pod) for pod, dtype in NUMPY_DTYPES_BY_POD.items()
+    if dtype != "object"
+)
+
+# array.array and memoryview type codes mapping to NumPy dtype name
+DTYPES_BY_TYPECODE = {"f": "float32", "d": "float64", "?": "bool"}
+for _code in "bBhHiIlLqQ":
+    DTYPES_BY_TYPECODE[_code] = "%sint%d" % (
+        "" if _code.islower() else "u", array.array(_code).itemsize * 8)
+
+# NumPy dtype name mapping to array.array type code
+TYPECODES_BY_DTYPE = dict(
+    (dtype, code) for code, dtype in sorted(DTYPES_BY_TYPECODE.items(),
+                                            reverse=True)
+    if code != "?"
+)
+
+# Imath array class mapping to array.array type code
+TYPECODES_BY_IMATH_ARRAY = {
+    imath.SignedCharArray: "b",
+    imath.UnsignedCharArray: "B",
+    imath.ShortArray: "h",
+    imath.UnsignedShortArray: "H",
+    imath.IntArray: "i",
+    imath.UnsignedIntArray: "I",
+    imath.FloatArray: "f",
+    imath.DoubleArray: "d",
+}
+
+# Python classes that are converted to Imath arrays as raw buffers
+_buffer_types = (bytearray, memoryview, array.array)
+if bytes is not str:
+    _buffer_types += (bytes,)
+if numpy is not None:
+    _buffer_types += (numpy.ndarray,)
+
 _COMPOUND_PROPERTY_VALUE_ERROR_ = "Compound properties cannot have values"
+_INT64_ARRAY_ERROR_ = "The imath binding has no 64-bit integer arrays"
+
+# maps schemaObjTitle metadata values to cask Object classes, filled in
+# by wrap() as schemas are first seen
+_CLASSES_BY_SCHEMA = {}
+
+_NUMPY_REQUIRED_ERROR_ = "NumPy is required for array access"
 
 
 def get_simple_oprop_class(prop):
@@ -299,7 +562,8 @@ def get_simple_oprop_class(prop):
     value = prop.values[0] if len(prop.values) > 0 else []
     if prop.iobject:
         is_array = prop.iobject.isArray()
-    elif type(value) in IMATH_ARRAYS_VALUES:
+    elif type(value) in IMATH_ARRAYS_VALUES or \
+            isinstance(value, _buffer_types + (TypedArray,)):
         is_array = True
     else:
         is_array = type(value) in [list, set] and len(value) > 1
@@ -313,28 +577,331 @@ def _delist(val):
     return val[0] if type(val) in [list, set] and len(val) == 1 else val
 
 
+def _buffer_dtype(value):
+    """Returns the NumPy dtype name and element shape of a buffer."""
+    if numpy is not None and isinstance(value, numpy.ndarray):
+        return value.dtype.name, value.shape[1:]
+    if isinstance(value, array.array):
+        return DTYPES_BY_TYPECODE.get(value.typecode), ()
+    view = memoryview(value)
+    return DTYPES_BY_TYPECODE.get(view.format.lstrip("@=<>!")), view.shape[1:]
+
+
+def _fits_dtype(source, dtype):
+    """Returns True if the values of a NumPy array can be stored in a
+    dtype without changing kind, e.g. floats to ints, or overflowing.
+    """
+    if not numpy.can_cast(source.dtype, dtype, "same_kind"):
+        return False
+    if dtype.kind in "iu" and source.size and source.dtype.kind in "iu":
+        info = numpy.iinfo(dtype)
+        return source.min() >= info.min and source.max() <= info.max
+    return True
+
+
+def _fill_imath_array(new_value, value):
+    """Copies all values into an imath array in one operation, if the
+    imath binding exposes the array buffer.
+
+    :param new_value: Imath array with the same number of elements as value.
+    :param value: Buffer or list of values.
+    :return: True if the values were copied.
+    """
+    if numpy is not None:
+        view = _numpy_view(new_value)
+        if view is not None and view.flags.writeable:
+            try:
+                source = numpy.asarray(value)
+                if source.size == view.size and _fits_dtype(source, view.dtype):
+                    view.reshape(-1)[:] = source.reshape(-1)
+                    return True
+            except (TypeError, ValueError):
+                pass
+    try:
+        view = memoryview(new_value)
+        if isinstance(value, (list, set)):
+            typecode = TYPECODES_BY_IMATH_ARRAY.get(type(new_value))
+            if typecode is None:
+                return False
+            value = array.array(typecode, value)
+        source = memoryview(value).cast("B")
+        if view.readonly or source.nbytes != view.nbytes:
+            return False
+        view.cast("B")[:] = source
+        return True
+    except (TypeError, ValueError, OverflowError, AttributeError,
+            NotImplementedError):
+        return False
+
+
+def _buffer_to_imath(value):
+    """Converts a NumPy array, array.array or bytes-like buffer to an
+    Imath array, e.g. an (N, 3) float32 ndarray to a V3fArray.
+    """
+    if numpy is not None and isinstance(value, numpy.ndarray) and value.ndim == 0:
+        return value.item()
+    dtype, shape = _buffer_dtype(value)
+    klass = IMATH_ARRAYS_BY_DTYPE.get((dtype, tuple(shape)))
+    if klass is None and dtype in ("int64", "uint64") and not shape:
+        raise TypeError(_INT64_ARRAY_ERROR_)
+    if klass is None:
+        raise TypeError("Unsupported buffer type: %s %s" % (dtype, shape))
+    new_value = klass(len(value))
+    if not _fill_imath_array(new_value, value):
+        for i in range(len(value)):
+            new_value[i] = value[i]
+    return new_value
+
+
 def python_to_imath(value):
-    """Converts Python lists to Imath arrays."""
+    """Converts Python lists and buffers to Imath arrays.
+
+    Lists of numbers, NumPy arrays, array.array and bytes-like objects are
+    copied into the Imath array in one operation where possible.
+    """
     if isinstance(value, DataType):
         return value.value()
     elif type(value) in IMATH_ARRAYS_VALUES:
         return value
+    elif isinstance(value, _buffer_types):
+        return _buffer_to_imath(value)
+    elif isinstance(value, TypedArray):
+        klass = IMATH_ARRAYS_BY_TYPE[type(value)]
+        if klass is None:
+            raise TypeError(_INT64_ARRAY_ERROR_)
+        new_value = klass(len(value))
+        if not _fill_imath_array(new_value, value.values):
+            for i, v in enumerate(value.values):
+                new_value[i] = v
+        return new_value
     value = _delist(value)
     is_array = type(value) in (set, list)
-    value0 = value[0] if is_array and len(value) > 0 else value
+    value0 = next(iter(value)) if is_array and len(value) > 0 else value
     if is_array:
-        new_value = IMATH_ARRAYS_BY_TYPE.get(type(value0))(len(value))
-        for i, v in enumerate(value):
-            new_value[i] = v
+        klass = IMATH_ARRAYS_BY_TYPE.get(type(value0))
+        if klass is None and type(value0) in (Int64, Uint64):
+            raise TypeError(_INT64_ARRAY_ERROR_)
+        new_value = klass(len(value))
+        if isinstance(value0, DataType):
+            value = [v.value() for v in value]
+        if not _fill_imath_array(new_value, list(value)):
+            for i, v in enumerate(value):
+                new_value[i] = v
         return new_value
     return value
 
 
+def _imath_element(value, shape):
+    """Returns an imath value as nested tuples matching the given shape."""
+    if len(shape) == 1:
+        return tuple(value[i] for i in range(shape[0]))
+    if hasattr(value, "min") and hasattr(value, "max"):
+        return (_imath_element(value.min(), shape[1:]),
+                _imath_element(value.max(), shape[1:]))
+    return tuple(_imath_element(value[i], shape[1:]) for i in range(shape[0]))
+
+
+def _numpy_view(value):
+    """Returns an ndarray sharing memory with an imath array, or None if the
+    imath binding does not expose the array buffer.
+    """
+    try:
+        return numpy.asarray(memoryview(value))
+    except (TypeError, ValueError):
+        pass
+    if imathnumpy is not None:
+        try:
+            return imathnumpy.arrayToNumpy(value)
+        except (TypeError, ValueError):
+            pass
+    return None
+
+
+def imath_to_numpy(value, dtype=None, extent=1):
+    """Converts an imath value or array to a NumPy ndarray. ::
+
+        >>> cask.imath_to_numpy(p.get_value()).shape
+        (2048, 3)
+
+    Arrays are returned as read-only views of the imath array buffer
+    when the imath binding allows it, and copied otherwise.
+
+    :param value: Imath value or array, or a Python scalar.
+    :param dtype: NumPy dtype, e.g. from NUMPY_DTYPES_BY_POD.
+    :param extent: Number of values per element of flat arrays.
+    :return: numpy.ndarray
+    """
+    if numpy is None:
+        raise ImportError(_NUMPY_REQUIRED_ERROR_)
+    klass = type(value)
+    element_shape = IMATH_SHAPES.get(klass, ())
+    if klass not in IMATH_ARRAYS_VALUES:
+        if element_shape:
+            value = _imath_element(value, element_shape)
+        return numpy.array(value, dtype=dtype)
+    if element_shape:
+        shape = (len(value),) + element_shape
+    elif extent > 1 and len(value) % extent == 0:
+        shape = (len(value) // extent, extent)
+    else:
+        shape = (len(value),)
+    array = None
+    if klass is not imath.StringArray:
+        array = _numpy_view(value)
+    if array is not None and array.size == numpy.prod(shape):
+        array = array.reshape(shape)
+        if dtype is not None and array.dtype != dtype:
+            array = array.astype(dtype)
+        array.flags.writeable = False
+        return array
+    if element_shape:
+        elements = [_imath_element(value[i], element_shape)
+                    for i in range(len(value))]
+    else:
+        elements = [value[i] for i in range(len(value))]
+    return numpy.array(elements, dtype=dtype).reshape(shape)
+
+
+# Imath value classes that support + and * for linear interpolation
+_LERP_CLASSES = set([
+    imath.V2f, imath.V2d, imath.V3f, imath.V3d, imath.Color3f,
+])
+
+
+def _matrix_rotation_scale(basis):
+    """Splits a 3x3 basis into a rotation matrix and per-axis scale.
+    Shear is ignored and a mirroring is moved into the x scale.
+    """
+    scale = numpy.sqrt((basis ** 2).sum(axis=1))
+    rotation = basis / numpy.where(scale == 0, 1.0, scale)[:, None]
+    if numpy.linalg.det(rotation) < 0:
+        scale[0] = -scale[0]
+        rotation[0] = -rotation[0]
+    return rotation, scale
+
+
+def _rotation_quat(m):
+    """Returns a 3x3 rotation matrix as a (w, x, y, z) quaternion."""
+    trace = m[0, 0] + m[1, 1] + m[2, 2]
+    if trace > 0:
+        s = numpy.sqrt(trace + 1.0) * 2
+        quat = (0.25 * s, (m[2, 1] - m[1, 2]) / s,
+                (m[0, 2] - m[2, 0]) / s, (m[1, 0] - m[0, 1]) / s)
+    elif m[0, 0] > m[1, 1] and m[0, 0] > m[2, 2]:
+        s = numpy.sqrt(1.0 + m[0, 0] - m[1, 1] - m[2, 2]) * 2
+        quat = ((m[2, 1] - m[1, 2]) / s, 0.25 * s,
+                (m[0, 1] + m[1, 0]) / s, (m[0, 2] + m[2, 0]) / s)
+    elif m[1, 1] > m[2, 2]:
+        s = numpy.sqrt(1.0 + m[1, 1] - m[0, 0] - m[2, 2]) * 2
+        quat = ((m[0, 2] - m[2, 0]) / s, (m[0, 1] + m[1, 0]) / s,
+                0.25 * s, (m[1, 2] + m[2, 1]) / s)
+    else:
+        s = numpy.sqrt(1.0 + m[2, 2] - m[0, 0] - m[1, 1]) * 2
+        quat = ((m[1, 0] - m[0, 1]) / s, (m[0, 2] + m[2, 0]) / s,
+                (m[1, 2] + m[2, 1]) / s, 0.25 * s)
+    return numpy.array(quat)
+
+
+def _quat_rotation(q):
+    """Returns a (w, x, y, z) unit quaternion as a 3x3 rotation matrix."""
+    w, x, y, z = q
+    return numpy.array([
+        [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+        [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+        [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)],
+    ])
+
+
+def _slerp(a, b, alpha):
+    """Spherical linear interpolation of two unit quaternions along the
+    shortest arc."""
+    dot = numpy.dot(a, b)
+    if dot < 0:
+        b, dot = -b, -dot
+    if dot > 0.9995:
+        quat = a + (b - a) * alpha
+        return quat / numpy.linalg.norm(quat)
+    theta = numpy.arccos(dot)
+    return (numpy.sin((1 - alpha) * theta) * a +
+            numpy.sin(alpha * theta) * b) / numpy.sin(theta)
+
+
+def _interpolate_matrix(a, b, alpha):
+    """Interpolates two imath matrices. 4x4 matrices are decomposed, with
+    the translation and scale lerped and the rotation slerped. Shear is
+    ignored.
+    """
+    if numpy is None:
+        raise ImportError(_NUMPY_REQUIRED_ERROR_)
+    start = imath_to_numpy(a, "float64")
+    end = imath_to_numpy(b, "float64")
+    result = start + (end - start) * alpha
+    if start.shape == (4, 4):
+        rotation_a, scale_a = _matrix_rotation_scale(start[:3, :3])
+        rotation_b, scale_b = _matrix_rotation_scale(end[:3, :3])
+        scale = scale_a + (scale_b - scale_a) * alpha
+        quat = _slerp(_rotation_quat(rotation_a), _rotation_quat(rotation_b),
+                      alpha)
+        result[:3, :3] = _quat_rotation(quat) * scale[:, None]
+    matrix = type(a)()
+    for i, row in enumerate(result):
+        for j, value in enumerate(row):
+            matrix[i][j] = value
+    return matrix
+
+
+def _interpolate_value(a, b, alpha):
+    """Interpolates between two sample values, where alpha is the weight
+    of b. Floats, float vectors and float arrays are lerped and matrices
+    are interpolated with _interpolate_matrix(). Other values, e.g. ints,
+    strings and arrays that change length, are held at a.
+    """
+    klass = type(a)
+    if klass is not type(b):
+        return a
+    if klass is float or klass in _LERP_CLASSES:
+        return a + (b - a) * alpha
+    if klass in (imath.M44d, imath.M44f, imath.M33d, imath.M33f):
+        return _interpolate_matrix(a, b, alpha)
+    if klass in IMATH_ARRAYS_VALUES and len(a) == len(b):
+        if numpy is None:
+            raise ImportError(_NUMPY_REQUIRED_ERROR_)
+        start = imath_to_numpy(a)
+        if start.dtype.kind != "f" or IMATH_ARRAYS_BY_DTYPE.get(
+                (start.dtype.name, start.shape[1:])) is not klass:
+            return a
+        result = start + (imath_to_numpy(b) - start) * alpha
+        return _buffer_to_imath(result.astype(start.dtype))
+    return a
+
+
+def _read_bracket(item, read, floor, ceil):
+    """Returns the samples at a floor and ceiling index. The last pair of
+    samples is kept on the item, so sweeping a time across an interval
+    only reads each sample once.
+
+    :param item: Object or Property with a _bracket slot.
+    :param read: Function that takes a sample index and returns a value.
+    """
+    bracket = item._bracket or {}
+    values = {}
+    for index in (floor, ceil):
+        values[index] = bracket[index] if index in bracket else read(index)
+    item._bracket = values
+    return values[floor], values[ceil]
+
+
 def get_pod_extent(prop):
     """Returns POD, extent tuple for given Property."""
     if len(prop.values) <= 0:
         return 1
     value = _delist(prop.values[0])
+    if isinstance(value, _buffer_types):
+        dtype, shape = _buffer_dtype(value)
+        extent = 1
+        for n in shape:
+            extent *= n
+        return (POD_BY_DTYPE.get(dtype, alembic.Util.POD.kUnknownPOD), extent)
     is_array = type(value) in (set, list)
     value0 = value[0] if is_array and len(value) > 0 else value
     try:
@@ -358,24 +925,49 @@ def wrapped(func):
     """
     @wraps(func)
     def with_wrapped_object(*args, **kwargs):
-        """wraps internal alembic iobject"""
-        iobj = args[0].iobject
-        for klass in IOBJECTS.values():
-            if iobj and klass.matches(iobj.getMetaData()):
-                args[0].iobject = klass(iobj.getParent(), iobj.getName())
+        """wraps internal alembic iobject, once per object"""
+        obj = args[0]
+        if not obj._typed:
+            iobj = obj.iobject
+            if iobj:
+                meta = iobj.getMetaData()
+                for klass in IOBJECTS.values():
+                    if klass.matches(meta):
+                        obj.iobject = klass(iobj.getParent(), iobj.getName())
+                        break
+                obj._typed = True
         return func(*args, **kwargs)
     return with_wrapped_object
 
 
+def _object_class(iobject):
+    """Returns the cask Object class for an IObject, looked up by the
+    schemaObjTitle metadata value. Schemas that have not been seen yet are
+    resolved with the class method "matches" and added to the table.
+    """
+    meta = iobject.getMetaData()
+    title = meta.get("schemaObjTitle")
+    klass = _CLASSES_BY_SCHEMA.get(title)
+    if klass is None:
+        klass = Object
+        if title:
+            for cls in Object.__subclasses__():
+                if cls.matches(iobject):
+                    klass = cls
+                    break
+        _CLASSES_BY_SCHEMA[title] = klass
+    return klass
+
+
 def wrap(iobject, time_sampling_id=None):
     """Returns a cask-wrapped class object based on the class method "matches".
     """
     if iobject.getName() == "ABC":
         return Top(iobject)
-    for cls in Object.__subclasses__():
-        if cls.matches(iobject):
-            return cls(iobject, time_sampling_id=time_sampling_id)
-    return Object(iobject)
+    cls = _object_class(iobject)
+    if cls is Object:
+        return Object(iobject)
+    return cls(iobject, time_sampling_id=time_sampling_id)
 
 
 def is_valid(archive):
@@ -388,34 +980,187 @@ def is_valid(archive):
         return False
 
 
-def find(obj, name=".*", types=None):
+def find(obj, name=".*", types=None, path=None, max_depth=None, limit=None,
+         metadata=None, properties=None, use_index=False):
     """Finds and returns a list of Objects with names matching
     a given regular expression. ::
 
         >>> find(a.top, ".*Shape")
         [<PolyMesh "cube1Shape">, <PolyMesh "cube2Shape">]
+        >>> find(a.top, types=["Camera"], path="/root/*/cam/**")
+        [<Camera "shotCam">]
 
     :param name: Regular expression to match object name
     :param types: Class type inclusion list
+    :param path: Glob pattern to match the full object path, where "*"
+        matches within one path component and "**" matches any number
+        of components
+    :param max_depth: Maximum depth to search below obj
+    :param limit: Maximum number of results, the search stops once found
+    :param metadata: Metadata keys, or dict of key values, to match
+    :param properties: Relative property paths the objects must have, e.g.
+        ".geom/.arbGeomParams/Cd"
+    :param use_index: Use the archive query index, see Archive.query
     :return: Sorted list of Object results
     """
-    results = [r for r in find_iter(obj, name, types)]
+    results = [r for r in find_iter(obj, name, types, path, max_depth, limit,
+                                    metadata, properties, use_index)]
     return sorted(results, key=lambda x: x.name)
 
 
-def find_iter(obj, name=".*", types=None):
+def _compile_path_glob(pattern):
+    """Returns a list of compiled regular expressions, one for each
+    component of a path glob, with None standing for "**"."""
+    parts = []
+    for part in pattern.strip("/").split("/"):
+        if part == "**":
+            if not parts or parts[-1] is not None:
+                parts.append(None)
+        elif part:
+            parts.append(re.compile(fnmatch.translate(part)))
+    return parts
+
+
+def _advance_path_glob(parts, states, name):
+    """Returns the glob states reached after matching one more path
+    component, from a set of indices into the compiled glob parts.
+    Returns the states for the root path if name is None."""
+    if name is None:
+        new_states = set([0])
+    else:
+        new_states = set()
+        for i in states:
+            if i == len(parts):
+                continue
+            if parts[i] is None:
+                new_states.add(i)
+            elif parts[i].match(name):
+                new_states.add(i + 1)
+    for i in sorted(new_states):
+        if i < len(parts) and parts[i] is None:
+            new_states.add(i + 1)
+    return new_states
+
+
+def find_iter(obj, name=".*", types=None, path=None, max_depth=None,
+              limit=None, metadata=None, properties=None, use_index=False):
     """Generator that yields Objects with names matching
     a given regular expression.
 
+    The search walks the object headers and only wraps the objects that
+    are yielded, and their parents. Branches that can not match the path
+    glob, or are deeper than max_depth, are not visited.
+
+    Queries on metadata or properties, or with use_index, are answered
+    from the Archive.query_index instead, and yield objects sorted by path.
+
     :param name: Regular expression to match object name
     :param types: Class type inclusion list
+    :param path: Glob pattern to match the full object path
+    :param max_depth: Maximum depth to search below obj
+    :param limit: Maximum number of results to yield
+    :param metadata: Metadata keys, or dict of key values, to match
+    :param properties: Relative property paths the objects must have
+    :param use_index: Use the archive query index
     :yields: Object with name matching name regex
     """
-    if re.match(name, obj.name) and (types is None or obj.type() in types):
-        yield obj
-    for child in obj.children.values():
-        for grandchild in find_iter(child, name, types):
-            yield grandchild
+    if limit is not None and limit <= 0:
+        return
+    regex = re.compile(name)
+    parts = None
+    states = None
+    if path is not None:
+        parts = _compile_path_glob(path)
+        states = _path_glob_states(parts, obj.path())
+
+    if use_index or metadata is not None or properties is not None:
+        archive = obj.archive()
+        if archive is None:
+            raise ValueError("Index queries need an object in an Archive")
+        root = obj.path()
+        prefix = root.rstrip("/") + "/"
+        root_depth = len([n for n in root.split("/") if n])
+        count = 0
+        for item_path in archive.query_index.query(
+                types=types, metadata=metadata, properties=properties):
+            if item_path != root and not item_path.startswith(prefix):
+                continue
+            names = [n for n in item_path.split("/") if n]
+            if max_depth is not None and len(names) - root_depth > max_depth:
+                continue
+            if not regex.match(names[-1] if names else "ABC"):
+                continue
+            if parts is not None and len(parts) not in _path_glob_states(
+                    parts, item_path):
+                continue
+            yield archive.get(item_path)
+            count += 1
+            if limit is not None and count >= limit:
+                return
+        return
+
+    def resolve(node):
+        """returns the wrapped object for a node, wrapping its parents"""
+        if node[0] is None:
+            node[0] = resolve(node[2]).children[node[3]]
+        return node[0]
+
+    def node_path(node):
+        """returns the full path of a node, without wrapping it"""
+        if node[0] is not None:
+            return node[0].path()
+        return node_path(node[2]).rstrip("/") + "/" + node[3]
+
+    archive = obj.archive()
+    path_filter = archive._path_filter if archive is not None else None
+
+    # nodes are [object or None, iobject, parent node, name, depth, states]
+    count = 0
+    stack = [[obj, obj.iobject, None, obj.name, 0, states]]
+    while stack:
+        node = stack.pop()
+        item, iobject, _, item_name, depth, states = node
+        if states is not None and not states:
+            continue
+
+        if (regex.match(item_name) and
+                (states is None or len(parts) in states) and
+                (types is None or (item.type() if item is not None else
+                                   _object_class(iobject).__name__) in types)):
+            yield resolve(node)
+            count += 1
+            if limit is not None and count >= limit:
+                return
+
+        if max_depth is not None and depth >= max_depth:
+            continue
+        child_dict = item._child_dict if item is not None else None
+        if child_dict is not None and (child_dict.visited or not iobject):
+            children = [
+                (None if child is _UNLOADED else child,
+                 iobject.getChild(child_name) if child is _UNLOADED else None,
+                 child_name)
+                for child_name, child in dict.items(child_dict)
+            ]
+        elif iobject:
+            children = []
+            prefix = None
+            if path_filter is not None:
+                prefix = node_path(node).rstrip("/") + "/"
+            for i in range(iobject.getNumChildren()):
+                child_name = iobject.getChildHeader(i).getName()
+                if prefix is None or path_filter(prefix + child_name):
+                    children.append((None, iobject.getChild(i), child_name))
+        else:
+            children = []
+        for child, child_iobject, child_name in reversed(children):
+            if child is not None:
+                child_iobject = child.iobject
+            child_states = states
+            if states is not None:
+                child_states = _advance_path_glob(parts, states, child_name)
+            stack.append([child, child_iobject, node, child_name,
+                          depth + 1, child_states])
 
 
 def copy(item, name=None):
@@ -440,6 +1185,314 @@ def copy(item, name=None):
     return new_item
 
 
+def _samples_equal(a, b):
+    """Returns True if two sample values are equal. Buffers, like imath
+    arrays, are compared by their bytes.
+    """
+    if a is b:
+        return True
+    if type(a) != type(b):
+        return False
+    if isinstance(a, TypedArray):
+        return _samples_equal(a.values, b.values)
+    if numpy is not None and isinstance(a, numpy.ndarray):
+        return a.dtype == b.dtype and a.shape == b.shape and \
+            bool(numpy.array_equal(a, b))
+    try:
+        return memoryview(a).cast("B") == memoryview(b).cast("B")
+    except (TypeError, ValueError, AttributeError):
+        pass
+    if type(a) in IMATH_ARRAYS_VALUES:
+        if len(a) != len(b):
+            return False
+        for i in range(len(a)):
+            if a[i] != b[i]:
+                return False
+        return True
+    try:
+        return bool(a == b)
+    except Exception:
+        return False
+
+
+def _metadata_dict(meta):
+    """Returns an Alembic MetaData object as a dict."""
+    metadata = {}
+    for field in meta.serialize().split(';'):
+        splits = field.split('=')
+        key = splits[0]
+        value = '='.join(splits[1:])
+        metadata[key] = value
+    return metadata
+
+
+def _copy_iproperty(iprop, oparent, time_sampling_id):
+    """Copies an IProperty, and its samples or sub-properties, to a new
+    OProperty without wrapping or converting anything.
+
+    :param iprop: Alembic IProperty to copy.
+    :param oparent: Alembic OCompoundProperty to copy to.
+    :param time_sampling_id: TimeSampling object ID of the new OProperty.
+    """
+    meta = iprop.getMetaData()
+    if iprop.isCompound():
+        oprop = alembic.Abc.OCompoundProperty(
+            oparent, iprop.getName(), meta, time_sampling_id
+        )
+        for i in range(iprop.getNumProperties()):
+            _copy_iproperty(iprop.getProperty(i), oprop, time_sampling_id)
+        return
+    if iprop.isArray():
+        klass = alembic.Abc.OArrayProperty
+    else:
+        klass = alembic.Abc.OScalarProperty
+    oprop = klass(oparent, iprop.getName(), iprop.getDataType(), meta,
+                  time_sampling_id)
+    set_from_previous = getattr(oprop, "setFromPrevious", None)
+    constant = iprop.isConstant()
+    for index in range(iprop.getNumSamples()):
+        try:
+            if index > 0 and constant and set_from_previous:
+                set_from_previous()
+            else:
+                oprop.setValue(iprop.getValue(index))
+        except Exception as err:
+            print("Error copying value on %s: %s %s\n%s" \
+                % (iprop.getName(), index, klass, err))
+
+
+def _copy_iobject(iobject, oparent, time_sampling_id, path_filter=None,
+                  path=None):
+    """Copies an IObject sub-tree to a new OObject without wrapping it.
+
+    :param iobject: Alembic IObject to copy.
+    :param oparent: Alembic OObject to copy to.
+    :param time_sampling_id: TimeSampling object ID of the new OObject.
+    :param path_filter: Optional _PathFilter, descendants it hides are
+        not copied.
+    :param path: Full path of the IObject, required with a path_filter.
+    """
+    oobject = alembic.Abc.OObject(
+        oparent, iobject.getName(), iobject.getMetaData(), time_sampling_id
+    )
+    iprops = iobject.getProperties()
+    oprops = oobject.getProperties()
+    for i in range(iprops.getNumProperties()):
+        _copy_iproperty(iprops.getProperty(i), oprops, time_sampling_id)
+    for i in range(iobject.getNumChildren()):
+        child_path = None
+        if path_filter is not None:
+            child_path = path.rstrip("/") + "/" + \
+                iobject.getChildHeader(i).getName()
+            if not path_filter(child_path):
+                continue
+        _copy_iobject(iobject.getChild(i), oobject, time_sampling_id,
+                      path_filter, child_path)
+
+
+def _iproperty_paths(icompound, prefix=""):
+    """Returns the relative paths of all the properties below an
+    ICompoundProperty, read from the property headers."""
+    paths = []
+    for i in range(icompound.getNumProperties()):
+        header = icompound.getPropertyHeader(i)
+        path = prefix + header.getName()
+        paths.append(path)
+        if header.isCompound():
+            paths.extend(_iproperty_paths(icompound.getProperty(i), path + "/"))
+    return paths
+
+
+def _property_paths(item, prefix=""):
+    """Returns the relative paths of all the properties below an Object or
+    compound Property. Properties that have not been wrapped are read from
+    the property headers."""
+    paths = []
+    props = item.properties
+    for name, prop in list(dict.items(props)):
+        path = prefix + name
+        paths.append(path)
+        if prop is _UNLOADED:
+            if isinstance(item, Property):
+                iprop = item.iobject.getProperty(name)
+            else:
+                iprop = item.iobject.getProperties().getProperty(name)
+            if iprop.isCompound():
+                paths.extend(_iproperty_paths(iprop, path + "/"))
+        elif prop.is_compound():
+            paths.extend(_property_paths(prop, path + "/"))
+    return paths
+
+
+def _path_glob_states(parts, path, states=None):
+    """Returns the glob states reached after matching the components of a
+    path, starting from the root states if states is None."""
+    if states is None:
+        states = _advance_path_glob(parts, None, None)
+    for component in path.split("/"):
+        if component and states:
+            states = _advance_path_glob(parts, states, component)
+    return states
+
+
+class _PathFilter(object):
+    """Decides which object paths of an archive are visible, from lists of
+    include and exclude path globs."""
+    def __init__(self, include=None, exclude=None):
+        self.include = None
+        if include is not None:
+            self.include = [_compile_path_glob(p) for p in include]
+        self.exclude = [_compile_path_glob(p) for p in exclude or ()]
+
+    def __call__(self, path):
+        """Returns True if the object at a full path is visible. Objects
+        are visible if they do not match an exclude glob, and if they
+        match an include glob, are below an object that does, or are
+        above objects that could."""
+        for parts in self.exclude:
+            if len(parts) in _path_glob_states(parts, path):
+                return False
+        if self.include is None:
+            return True
+        for parts in self.include:
+            states = _advance_path_glob(parts, None, None)
+            for component in path.split("/"):
+                if len(parts) in states:
+                    return True
+                if component:
+                    states = _advance_path_glob(parts, states, component)
+                if not states:
+                    break
+            if states:
+                return True
+        return False
+
+
+def _loaded_values(container):
+    """Returns the wrapped items of a DeepDict, which may not have been
+    created yet."""
+    if container is None:
+        return []
+    return container.loaded_values()
+
+
+def _owner_archive(item):
+    """Returns the Archive an Object or Property belongs to, following the
+    parents that have been set without wrapping any, or None.
+    """
+    try:
+        while item is not None and not isinstance(item, Archive):
+            item = item._parent
+    except (AttributeError, ReferenceError):
+        return None
+    return item
+
+
+def _hierarchy_changed(item):
+    """Invalidates the indexes of the archive an item belongs to, after
+    it is moved in a way the indexes can not follow.
+    """
+    archive = _owner_archive(item)
+    if archive is not None:
+        archive._hierarchy_version += 1
+
+
+def _object_added(parent, name, item):
+    """Updates the index of the archive an Object belongs to, after a child
+    is set on it.
+    """
+    archive = _owner_archive(parent)
+    if archive is not None:
+        archive._index_object(parent.path().rstrip("/") + "/" + name, item)
+
+
+def _object_removed(parent, name):
+    """Removes a child of an Object, and the objects below it, from the
+    index of the archive it belongs to.
+    """
+    archive = _owner_archive(parent)
+    if archive is not None:
+        archive._unindex(parent.path().rstrip("/") + "/" + name)
+
+
+def _children_cleared(obj):
+    """Updates the index of the archive an Object belongs to, after its
+    children are cleared.
+    """
+    archive = _owner_archive(obj)
+    if archive is not None:
+        archive._index_object(obj.path(), obj)
+
+
+def _metadata_changed(item):
+    """Invalidates the query index of the archive an Object or Property
+    belongs to, after its metadata or the properties below it are changed.
+    """
+    archive = _owner_archive(item)
+    if archive is not None:
+        archive._query_index = None
+
+
+class _Metadata(dict):
+    """Metadata dict of an Object, which invalidates the archive query
+    index when it is changed. Copies are plain dicts.
+    """
+    __slots__ = ("owner",)
+
+    def __init__(self, owner, *args, **kwargs):
+        super(_Metadata, self).__init__(*args, **kwargs)
+        self.owner = owner
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+    def __setitem__(self, key, value):
+        super(_Metadata, self).__setitem__(key, value)
+        _metadata_changed(self.owner)
+
+    def __delitem__(self, key):
+        super(_Metadata, self).__delitem__(key)
+        _metadata_changed(self.owner)
+
+    def clear(self):
+        super(_Metadata, self).clear()
+        _metadata_changed(self.owner)
+
+    def pop(self, *args):
+        value = super(_Metadata, self).pop(*args)
+        _metadata_changed(self.owner)
+        return value
+
+    def popitem(self):
+        item = super(_Metadata, self).popitem()
+        _metadata_changed(self.owner)
+        return item
+
+    def setdefault(self, key, value=None):
+        if key in self:
+            return self[key]
+        self[key] = value
+        return value
+
+    def update(self, *args, **kwargs):
+        super(_Metadata, self).update(*args, **kwargs)
+        _metadata_changed(self.owner)
+
+
+def _clear_paths(item):
+    """Clears the cached paths of an item and of its wrapped descendants,
+    after the item has been renamed or moved.
+    """
+    stack = [item]
+    while stack:
+        item = stack.pop()
+        item._path = None
+        if isinstance(item, Property):
+            item._sampling = None
+        stack.extend(_loaded_values(item._prop_dict))
+        stack.extend(_loaded_values(getattr(item, "_child_dict", None)))
+
+
 def _deep_getitem(access_func, key):
     """Facilitates deep dict get item on DeepDict class.
     """
@@ -449,16 +1502,34 @@ def _deep_getitem(access_func, key):
     return access_func(start).get_item(rest)
 
 
+class _Unloaded(object):
+    """Placeholder for children and properties that have not been wrapped
+    yet.
+    """
+    def __repr__(self):
+        return "<unloaded>"
+
+_UNLOADED = _Unloaded()
+
+
 class DeepDict(dict):
     """Special dict subclass that allows deep dictionary access, renaming when
-    setting items and reflective reparenting.
+    setting items and reflective reparenting. Setting an item moves it from
+    its previous parent, and marks the parent as changed.
+
+    Items read from an archive can be added as placeholders, which are only
+    wrapped when they are accessed, so `len()`, `in` and `keys()` never
+    wrap anything.
     """
 
+    __slots__ = ("parent", "klass", "visited", "_snapshot")
+
     def __init__(self, parent, klass=None):
         super(DeepDict, self).__init__()
         self.parent = parent
         self.klass = klass
         self.visited = False
+        self._snapshot = None
 
     def __getitem__(self, item):
         if type(item) == str:
@@ -469,10 +1540,25 @@ class DeepDict(dict):
             if "/" in item:
                 return _deep_getitem(self.__getitem__, item)
             else:
-                item = super(DeepDict, self).__getitem__(item)
+                name = item
+                item = super(DeepDict, self).__getitem__(name)
+                if item is _UNLOADED:
+                    if self.klass is Property:
+                        item = self.parent._wrap_property(name)
+                    else:
+                        item = self.parent._wrap_child(name)
+                    super(DeepDict, self).__setitem__(name, item)
+                    self._snapshot = None
                 item._parent = self.parent
                 return item
 
+    def get(self, key, default=None):
+        """Returns an item by name or deep path, or the default."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
     def __setitem__(self, name, item):
         if self.klass and not isinstance(item, self.klass):
             raise Exception("Invalid item class: %s" % item.type())
@@ -502,35 +1588,616 @@ class DeepDict(dict):
                 obj = obj.parent
             return obj.set_item(name, item)
 
+        old_parent = item._parent
+        if old_parent is not None and old_parent is not obj:
+            if isinstance(item, Object):
+                old_dict = getattr(old_parent, "_child_dict", None)
+            else:
+                old_dict = getattr(old_parent, "_prop_dict", None)
+            if old_dict is not None and dict.get(old_dict, item._name) is item:
+                del old_dict[item._name]
+        if item._name is not None and item._name != name:
+            item._dirty = True
         item._name = name
         item._parent = obj
+        obj._dirty = True
         self.visited = True
+        self._snapshot = None
+        _clear_paths(item)
+        if self.klass is Property:
+            _metadata_changed(obj)
+        else:
+            _object_added(obj, name, item)
         return super(DeepDict, self).__setitem__(name, item)
 
+    def __delitem__(self, name):
+        self.parent._dirty = True
+        self._snapshot = None
+        item = super(DeepDict, self).__getitem__(name)
+        if item is not _UNLOADED:
+            _clear_paths(item)
+        if self.klass is Property:
+            _metadata_changed(self.parent)
+        else:
+            _object_removed(self.parent, name)
+        return super(DeepDict, self).__delitem__(name)
+
+    def _add_unloaded(self, name):
+        """Adds a placeholder for an item that has not been wrapped yet."""
+        super(DeepDict, self).__setitem__(name, _UNLOADED)
+        self._snapshot = None
+
+    def __iter__(self):
+        # Defined here so that dict(children) and {**children} copy through
+        # keys() and __getitem__, which wraps items that are not loaded yet.
+        return super(DeepDict, self).__iter__()
+
     def remove(self, key):
         """Removes an item if it exists."""
         if key and key in self:
             self.pop(key)
 
-    if sys.version[0] != "2":
-        # Code in this module was written in the Python 2 style, where
-        # a dictionary's `values()` is an independent copy of all the data.
-        # Since Python 3, `values()` becomes a view, which raises
-        # `RuntimeError` if the dictionary is modified while iterating.
-        def values(self):
-            """Dictionary values copied into a list, to preserve Python 2 behavior"""
-            view = super(DeepDict, self).values()
-            return list(view)
+    def pop(self, name, *default):
+        """Removes and returns an item, wrapping it first if it has not been
+        wrapped yet. Returns the default if given and the item is missing.
+        """
+        if name not in self:
+            if default:
+                return default[0]
+            raise KeyError(name)
+        item = self[name]
+        del self[name]
+        return item
+
+    def popitem(self):
+        """Removes and returns the last (name, item) pair."""
+        if not self:
+            raise KeyError("popitem(): dictionary is empty")
+        name = list(self.keys())[-1]
+        return name, self.pop(name)
+
+    def copy(self):
+        """Returns a plain dict of the items, wrapping any items that have
+        not been wrapped yet.
+        """
+        return dict(self.items())
+
+    def clear(self):
+        self._snapshot = None
+        return super(DeepDict, self).clear()
+
+    def update(self, *args, **kwargs):
+        """Sets each item, reparenting it like setting a single item."""
+        for name, item in dict(*args, **kwargs).items():
+            self[name] = item
+
+    def setdefault(self, name, item=None):
+        """Returns the item for a name, setting it first if it is missing."""
+        if name in self:
+            return self[name]
+        self[name] = item
+        return item
+
+    # Code in this module was written in the Python 2 style, where
+    # a dictionary's `values()` is an independent copy of all the data.
+    # Since Python 3, `values()` becomes a view, which raises
+    # `RuntimeError` if the dictionary is modified while iterating.
+    # The copy is a tuple that is kept until the dict changes.
+    def values(self):
+        """Dictionary values copied into a tuple, which is safe to iterate
+        while the dict changes, like Python 2. The tuple is only copied
+        again after the dict changes. Items that have not been wrapped yet
+        are wrapped.
+        """
+        if self._snapshot is None:
+            values = tuple(self[name] for name in list(self.keys()))
+            self._snapshot = values
+        return self._snapshot
+
+    def items(self):
+        """Dictionary items copied into a list, wrapping any items that
+        have not been wrapped yet.
+        """
+        return list(zip(list(self.keys()), self.values()))
+
+    def loaded_values(self):
+        """Returns a list of the items that have been wrapped."""
+        return [item for item in super(DeepDict, self).values()
+                if item is not _UNLOADED]
+
+
+class SampleList(object):
+    """Lazy, list-like sequence of sample values. Samples are read with the
+    given reader function only when they are indexed, sliced or iterated
+    over, and only the samples that have been read are kept. ::
+
+        >>> p = a.top.children["meshy"].properties[".geom/P"]
+        >>> p.values[100:200:2]  # reads 50 samples
+
+    Setting an index or appending stores the given value in place of the
+    sample read from the archive.
+    """
+
+    def __init__(self, reader, length, cache=None, key=None, itemsize=None):
+        """
+        :param reader: Function that takes a sample index and returns a value.
+        :param length: Number of samples available from the reader.
+        :param cache: Optional SampleCache that holds the samples read.
+        :param key: Cache key for these samples, e.g. the path the property
+            was read from.
+        :param itemsize: Size in bytes of one sample element, if known.
+        """
+        super(SampleList, self).__init__()
+        self._reader = reader
+        self._length = length
+        self._cache = cache
+        self._key = key
+        self._itemsize = itemsize
+        self._samples = {}
+        self.modified = False
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        for i in range(self._length):
+            yield self[i]
+
+    def __eq__(self, other):
+        try:
+            if len(self) != len(other):
+                return False
+        except TypeError:
+            return False
+        return list(self) == list(other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def __check_index(self, index):
+        if index < 0:
+            index += self._length
+        if index < 0 or index >= self._length:
+            raise IndexError("sample index out of range")
+        return index
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        index = self.__check_index(index)
+        try:
+            return self._samples[index]
+        except KeyError:
+            pass
+        if self._cache is not None:
+            return self._cache.fetch((self._key, index),
+                                     lambda: self._read(index), self._itemsize)
+        value = self._read(index)
+        self._samples[index] = value
+        return value
+
+    def __setitem__(self, index, value):
+        self.modified = True
+        if isinstance(index, slice):
+            indices = range(*index.indices(self._length))
+            value = list(value)
+            if len(indices) != len(value):
+                raise ValueError("can not resize a SampleList with a slice")
+            for i, v in zip(indices, value):
+                self._samples[i] = v
+        else:
+            self._samples[self.__check_index(index)] = value
+
+    def _read(self, index):
+        """Reads the sample at a given index, bypassing stored values."""
+        try:
+            return self._reader(index)
+        except RuntimeError as err:
+            print("Bad value on sample:", index, err)
+            return str(err)
+
+    def peek(self, index):
+        """Returns the sample at a given index without adding it to the
+        cache, e.g. when reading many samples once.
+        """
+        index = self.__check_index(index)
+        try:
+            return self._samples[index]
+        except KeyError:
+            pass
+        if self._cache is not None and (self._key, index) in self._cache:
+            return self._cache.get((self._key, index))
+        return self._read(index)
+
+    def stored(self, index, default=None):
+        """Returns the sample at a given index if it has been set or read,
+        otherwise the default, without reading from the archive.
+        """
+        try:
+            return self._samples[index]
+        except KeyError:
+            pass
+        if self._cache is not None:
+            return self._cache.get((self._key, index), default)
+        return default
+
+    def append(self, value):
+        """Appends a value to the end of the sequence."""
+        self.modified = True
+        self._samples[self._length] = value
+        self._length += 1
+
+    def extend(self, values):
+        """Appends each value to the end of the sequence."""
+        for value in values:
+            self.append(value)
+
+
+def _sample_nbytes(value, itemsize=None):
+    """Returns an estimate of the memory held by a sample value.
+
+    :param value: Sample value, e.g. an imath array.
+    :param itemsize: Size in bytes of one element of value, if known.
+    """
+    if isinstance(value, _string_types):
+        return len(value)
+    try:
+        return memoryview(value).nbytes
+    except TypeError:
+        pass
+    try:
+        length = len(value)
+    except TypeError:
+        return itemsize or sys.getsizeof(value)
+    if length and isinstance(value[0], _string_types):
+        return sum(len(v) for v in value)
+    if itemsize:
+        return length * itemsize
+    return sys.getsizeof(value) + (length and length * sys.getsizeof(value[0]))
+
+
+class SampleCache(object):
+    """Least recently used cache of sample values with a byte budget.
+    Every Archive has one, shared by all of its Properties and Objects,
+    keyed by path and sample index. ::
+
+        >>> a = cask.Archive("shot.abc", cache_size=2 * 1024 ** 3)
+        >>> a.sample_cache.max_bytes = 512 * 1024 ** 2
+
+    When the budget is exceeded, the least recently used samples are
+    evicted and read again from the archive when they are next accessed.
+    A budget of None means the cache is unbounded.
+    """
+
+    def __init__(self, max_bytes=None):
+        """
+        :param max_bytes: Byte budget, or None for no limit.
+        """
+        super(SampleCache, self).__init__()
+        self._items = OrderedDict()
+        self._max_bytes = max_bytes
+        self.nbytes = 0
+
+    def __repr__(self):
+        return '<%s %d samples, %d bytes>' % (
+            self.__class__.__name__, len(self), self.nbytes)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __get_max_bytes(self):
+        return self._max_bytes
+
+    def __set_max_bytes(self, max_bytes):
+        self._max_bytes = max_bytes
+        self.__evict()
+
+    max_bytes = property(__get_max_bytes, __set_max_bytes,
+                         doc="Byte budget for cached samples, or None.")
+
+    def __evict(self):
+        if self._max_bytes is None:
+            return
+        while self._items and self.nbytes > self._max_bytes:
+            _, (_, nbytes) = self._items.popitem(last=False)
+            self.nbytes -= nbytes
+
+    def get(self, key, default=None):
+        """Returns a cached value and marks it as recently used."""
+        try:
+            item = self._items.pop(key)
+        except KeyError:
+            return default
+        self._items[key] = item
+        return item[0]
+
+    def put(self, key, value, itemsize=None):
+        """Adds a value to the cache, evicting older values if needed.
+
+        :param key: Cache key, e.g. (path, index).
+        :param value: Sample value.
+        :param itemsize: Size in bytes of one element of value, if known.
+        """
+        self.discard(key)
+        nbytes = _sample_nbytes(value, itemsize)
+        self._items[key] = (value, nbytes)
+        self.nbytes += nbytes
+        self.__evict()
+
+    def fetch(self, key, reader, itemsize=None):
+        """Returns a cached value, calling reader() to get it when missing.
+        """
+        try:
+            item = self._items.pop(key)
+        except KeyError:
+            value = reader()
+            self.put(key, value, itemsize)
+            return value
+        self._items[key] = item
+        return item[0]
+
+    def discard(self, key):
+        """Removes a value from the cache if it exists."""
+        item = self._items.pop(key, None)
+        if item is not None:
+            self.nbytes -= item[1]
+
+    def clear(self):
+        """Removes all values from the cache."""
+        self._items.clear()
+        self.nbytes = 0
+
+
+def _sample_cache(item):
+    """Returns the SampleCache of the Archive an Object or Property
+    belongs to, or None.
+    """
+    try:
+        archive = item.archive()
+    except (AttributeError, ReferenceError):
+        return None
+    return getattr(archive, "sample_cache", None)
+
+
+def _source_path(iproperty):
+    """Returns the full path an Alembic IProperty was read from. Unlike
+    the path of the Property wrapping it, it does not change when the
+    Property or its parents are renamed or replaced, so cached samples
+    are keyed on it.
+    """
+    names = []
+    prop = iproperty
+    while prop.getName():
+        names.append(prop.getName())
+        prop = prop.getParent()
+    path = iproperty.getObject().getFullName().rstrip("/")
+    return "/".join([path] + names[::-1])
+
+
+class IndexEntry(object):
+    """Archive index entry for one object."""
+    __slots__ = ("path", "header", "item")
+
+    def __init__(self, path, header=None, item=None):
+        """
+        :param path: full path of the object.
+        :param header: Alembic ObjectHeader, or None for new objects.
+        :param item: wrapped cask Object, or None if not wrapped yet.
+        """
+        self.path = path
+        self.header = header
+        self.item = item
+
+    def __repr__(self):
+        return '<IndexEntry "%s">' % self.path
+
+
+class QueryIndex(object):
+    """Archive index of object paths by type, metadata and property paths.
+    """
+    def __init__(self):
+        super(QueryIndex, self).__init__()
+        self.paths = set()
+        self.types = {}
+        self.metadata_keys = {}
+        self.metadata = {}
+        self.properties = {}
+
+    def __repr__(self):
+        return "<QueryIndex %d objects>" % len(self.paths)
+
+    def add(self, path, type_name, metadata, property_paths):
+        """Adds an object to the index.
+
+        :param path: full path of the object.
+        :param type_name: cask type name of the object.
+        :param metadata: metadata dict of the object.
+        :param property_paths: relative paths of all of its properties.
+        """
+        self.paths.add(path)
+        self.types.setdefault(type_name, set()).add(path)
+        for key, value in metadata.items():
+            if key:
+                self.metadata_keys.setdefault(key, set()).add(path)
+                self.metadata.setdefault((key, value), set()).add(path)
+        for prop_path in property_paths:
+            self.properties.setdefault(prop_path, set()).add(path)
+
+    def query(self, types=None, schema=None, metadata=None, properties=None):
+        """Returns the sorted paths of the objects matching all the given
+        conditions. ::
+
+            >>> a.query_index.query(types=["PolyMesh"],
+            ...                     properties=[".geom/.arbGeomParams/Cd"])
+            ['/root/geo/mesh']
+
+        :param types: Class type inclusion list
+        :param schema: Schema name, or list of schema names, to match
+        :param metadata: Metadata keys, or dict of key values, to match.
+            A value of None matches any value.
+        :param properties: Relative property paths the objects must have
+        :return: Sorted list of object paths
+        """
+        found = [self.paths]
+        if types is not None:
+            found.append(set().union(
+                *[self.types.get(t, ()) for t in types]))
+        if schema is not None:
+            if isinstance(schema, _string_types):
+                schema = [schema]
+            found.append(set().union(
+                *[self.metadata.get(("schema", s), ()) for s in schema]))
+        if metadata is not None:
+            if isinstance(metadata, dict):
+                items = metadata.items()
+            else:
+                items = [(key, None) for key in metadata]
+            for key, value in items:
+                if value is None:
+                    found.append(self.metadata_keys.get(key, set()))
+                else:
+                    found.append(self.metadata.get((key, value), set()))
+        if properties is not None:
+            for prop_path in properties:
+                found.append(self.properties.get(prop_path.strip("/"), set()))
+        found.sort(key=len)
+        return sorted(found[0].intersection(*found[1:]))
+
+
+def _time_sampling_key(ts):
+    """Returns a hashable key that is equal for equal TimeSamplings."""
+    tst = ts.getTimeSamplingType()
+    return (tst.getNumSamplesPerCycle(), tst.getTimePerCycle(),
+            tuple(ts.getStoredTimes()))
+
+
+def _sample_bracket(ts, num_samples, time):
+    """Returns the indices of the samples at or before and at or after a
+    time, and the weight of the later sample, e.g. (3, 4, 0.25).
+    """
+    if num_samples < 2:
+        return 0, 0, 0.0
+    floor = ts.getFloorIndex(time, num_samples)[0]
+    ceil = ts.getCeilIndex(time, num_samples)[0]
+    if ceil <= floor:
+        return floor, floor, 0.0
+    start = ts.getSampleTime(floor)
+    alpha = (time - start) / (ts.getSampleTime(ceil) - start)
+    return floor, ceil, min(max(alpha, 0.0), 1.0)
+
+
+class TimeSamplingTable(object):
+    """Time samplings of an archive, with cached sample times for mapping
+    many frames or times to sample indices at once.
+    """
+    def __init__(self, timesamplings):
+        """
+        :param timesamplings: List of Alembic TimeSampling objects.
+        """
+        super(TimeSamplingTable, self).__init__()
+        self.timesamplings = list(timesamplings)
+        self._ids = {}
+        for tsid, ts in enumerate(self.timesamplings):
+            self._ids.setdefault(_time_sampling_key(ts), tsid)
+        self._times = {}
+
+    def __repr__(self):
+        return "<TimeSamplingTable %d>" % len(self.timesamplings)
+
+    def __len__(self):
+        return len(self.timesamplings)
+
+    def find(self, ts):
+        """Returns the index of a TimeSampling equal to ts, or None."""
+        return self._ids.get(_time_sampling_key(ts))
+
+    def start_time(self, tsid):
+        """Returns the time of the first sample."""
+        return self.timesamplings[tsid].getSampleTime(0)
+
+    def end_time(self, tsid, num_samples):
+        """Returns the time of the last of num_samples samples."""
+        return self.timesamplings[tsid].getSampleTime(max(num_samples - 1, 0))
+
+    def sample_times(self, tsid, num_samples):
+        """Returns the times of the first num_samples samples as a NumPy
+        array. The times are cached.
+        """
+        if numpy is None:
+            raise ImportError(_NUMPY_REQUIRED_ERROR_)
+        times = self._times.get(tsid)
+        if times is None or len(times) < num_samples:
+            ts = self.timesamplings[tsid]
+            tst = ts.getTimeSamplingType()
+            stored = numpy.array(ts.getStoredTimes(), dtype="float64")
+            if tst.isAcyclic():
+                times = stored
+            else:
+                per_cycle = tst.getNumSamplesPerCycle()
+                indices = numpy.arange(num_samples)
+                times = stored[indices % per_cycle] + \
+                    (indices // per_cycle) * tst.getTimePerCycle()
+            times.flags.writeable = False
+            self._times[tsid] = times
+        return times[:num_samples]
+
+    def near_index(self, tsid, num_samples, time):
+        """Returns the index of the sample nearest to a time."""
+        return self.timesamplings[tsid].getNearIndex(float(time), num_samples)
+
+    def bracket(self, tsid, num_samples, time):
+        """Returns the indices of the samples at or before and at or after
+        a time, and the weight of the later sample, e.g. (3, 4, 0.25).
+        """
+        return _sample_bracket(self.timesamplings[tsid], num_samples,
+                               float(time))
+
+    def near_indices(self, tsid, num_samples, times):
+        """Returns a list of the indices of the samples nearest to a list
+        of times, the same as TimeSampling.getNearIndex(). Ties go to the
+        later sample.
+        """
+        if numpy is None or num_samples < 1:
+            ts = self.timesamplings[tsid]
+            return [ts.getNearIndex(float(time), num_samples) for time in times]
+        sample_times = self.sample_times(tsid, num_samples)
+        times = numpy.asarray(times, dtype="float64")
+        last = len(sample_times) - 1
+        ceil = numpy.clip(numpy.searchsorted(sample_times, times), 0, last)
+        floor = numpy.clip(ceil - 1, 0, last)
+        nearer = (times - sample_times[floor]) < (sample_times[ceil] - times)
+        return numpy.where(nearer, floor, ceil).tolist()
 
 
 class Archive(object):
     """Archive I/O Object"""
 
-    def __init__(self, filepath=None, fps=24):
-        """Creates a new Archive class object.
+    def __init__(self, filepath=None, fps=24, cache_size=None, include=None,
+                 exclude=None):
+        """Creates a new Archive class object. ::
+
+            >>> a = cask.Archive("shot.abc", include=["/root/world/lgt/**"])
+
+        Objects hidden by the include and exclude path globs are skipped
+        when children are read from the object headers. They are never
+        wrapped, indexed, found or written by write_to_file.
 
         :param filepath: Path to Alembic archive file.
         :param fps: Frames per second (default 24).
+        :param cache_size: Byte budget for cached samples (default None,
+            which is unbounded).
+        :param include: Path globs of the objects to read, e.g.
+            "/root/world/lgt/**", or None to read everything.
+        :param exclude: Path globs of the objects to skip, with everything
+            below them.
         """
         if filepath and not os.path.isfile(filepath):
             raise RuntimeError("Nonexistent file: %s" % filepath)
@@ -538,10 +2205,23 @@ class Archive(object):
         self.filepath = None
         self.id = id(self)
 
+        # samples read from the archive, shared by objects and properties
+        self.sample_cache = SampleCache(cache_size)
+
         # internal object attributes
         self._iobject = None
         self._oobject = None
         self._top = None
+        self._index = {}
+        self._index_complete = False
+        self._index_pending = []
+        self._index_version = None
+        self._hierarchy_version = 0
+        self._query_index = None
+        self._xform_plan = None
+        self._path_filter = None
+        if include is not None or exclude:
+            self._path_filter = _PathFilter(include, exclude)
 
         # time sampling attributes
         self.time_sampling_id = 0
@@ -596,6 +2276,7 @@ class Archive(object):
 
     def __set_top(self, top):
         self._top = top
+        self._hierarchy_version += 1
 
     top = property(__get_top, __set_top,
                    doc="Hierarchy root, cask.Top object.")
@@ -609,6 +2290,8 @@ class Archive(object):
         self.top = None
         self.__get_iobject()
         self.__time_sampling_objects = []
+        self.__read_time_samplings = None
+        self.__time_sampling_table = None
         self.time_sampling_id = max(len(self.timesamplings) - 1, 0)
 
     def info(self):
@@ -649,17 +2332,30 @@ class Archive(object):
         """Generator that yields tuples of (index, TimeSampling) objects.
         """
         if not self.__time_sampling_objects and self.iobject:
-            iarch = self.iobject
-            num_samples = iarch.getNumTimeSamplings()
-            return [iarch.getTimeSampling(i) for i in range(num_samples)]
+            if self.__read_time_samplings is None:
+                iarch = self.iobject
+                num_samples = iarch.getNumTimeSamplings()
+                self.__read_time_samplings = [
+                    iarch.getTimeSampling(i) for i in range(num_samples)
+                ]
+            return self.__read_time_samplings
         return self.__time_sampling_objects
 
     def add_timesampling(self, ts):
         if ts not in self.timesamplings:
             self.__time_sampling_objects.append(ts)
             self.__start_time = self.__end_time = None
+            self.__time_sampling_table = None
         return self.timesamplings.index(ts)
 
+    @property
+    def time_sampling_table(self):
+        """TimeSamplingTable of the archive time samplings, built once and
+        rebuilt after time samplings are added."""
+        if self.__time_sampling_table is None:
+            self.__time_sampling_table = TimeSamplingTable(self.timesamplings)
+        return self.__time_sampling_table
+
     def time_range(self):
         """Returns a tuple of the global start and end time in seconds.
 
@@ -672,21 +2368,15 @@ class Archive(object):
         if self.__start_time is not None and self.__end_time is not None:
             return (self.__start_time, self.__end_time)
 
-        num_stored_times = 1
-
+        table = self.time_sampling_table
         for index, ts in enumerate(self.timesamplings):
-            tst = ts.getTimeSamplingType()
-            if tst.isCyclic() or tst.isUniform():
-                tpc = tst.getNumSamplesPerCycle()
-                self.__start_time = ts.getStoredTimes()[0]
-                self.__end_time = self.__start_time +\
-                    (((self.iobject.getMaxNumSamplesForTimeSamplingIndex(index) / tpc) - 1)\
-                    / float(self.fps))
-            elif tst.isAcyclic():
-                num_times = ts.getNumStoredTimes()
-                num_stored_times = num_times
-                self.__start_time = ts.getSampleTime(0)
-                self.__end_time = ts.getSampleTime(num_times-1)
+            if ts.getTimeSamplingType().isAcyclic():
+                num_samples = ts.getNumStoredTimes()
+            else:
+                num_samples = \
+                    self.iobject.getMaxNumSamplesForTimeSamplingIndex(index)
+            self.__start_time = table.start_time(index)
+            self.__end_time = table.end_time(index, num_samples)
 
         if self.__start_time is None:
             self.__start_time = 0.0
@@ -726,27 +2416,357 @@ class Archive(object):
         """Returns a tuple of the global start and end times in frames."""
         return (self.start_frame(), self.end_frame())
 
+    def __check_index(self):
+        """Clears the index if the hierarchy has changed since it was built.
+        """
+        if self._index_version != self._hierarchy_version:
+            self._index = {}
+            self._index_complete = False
+            self._index_pending = []
+            self._query_index = None
+            self._xform_plan = None
+            self._index_version = self._hierarchy_version
+
+    @property
+    def index(self):
+        """Map of full object paths to IndexEntry objects, holding the
+        object header and the wrapped Object, if it has been wrapped. ::
+
+            >>> a.index["/root/world/geo/mesh"].header.getMetaData()
+
+        The index is built from the object headers the first time it is
+        accessed, without wrapping anything. When objects are added,
+        removed, renamed or moved, only the entries below them are updated.
+        """
+        self.__check_index()
+        if not self._index_complete:
+            walks = [self.__walk()]
+        else:
+            walks = [self.__walk(path, self._index[path].item)
+                     for path in self._index_pending if path in self._index]
+        self._index_pending = []
+        for walk in walks:
+            for path, obj, iobject in walk:
+                entry = self._index.get(path)
+                if entry is None:
+                    header = iobject.getHeader() if iobject else None
+                    self._index[path] = IndexEntry(path, header, obj)
+                elif obj is not None:
+                    entry.item = obj
+        self._index_complete = True
+        return self._index
+
+    def _index_object(self, path, item):
+        """Sets the index entry of an Object set at a full path, replacing
+        the entries of the objects that were there. The objects below it
+        are added the next time the index is accessed.
+        """
+        self._unindex(path)
+        header = item.iobject.getHeader() if item.iobject else None
+        self._index[path] = IndexEntry(path, header, item)
+        if self._index_complete:
+            self._index_pending.append(path)
+
+    def _unindex(self, path):
+        """Removes the index entries of the object at a full path and of
+        the objects below it. The query index and the world matrix plan
+        are rebuilt when they are next used.
+        """
+        self.__check_index()
+        prefix = path.rstrip("/") + "/"
+        for key in list(self._index):
+            if key == path or key.startswith(prefix):
+                del self._index[key]
+        self._query_index = None
+        self._xform_plan = None
+
+    def __walk(self, path="/", obj=None):
+        """Yields the full path, wrapped Object, or None if it has not been
+        wrapped, and IObject of every object in the hierarchy, or below
+        the object at a full path.
+        """
+        if obj is None:
+            obj = self.top
+        stack = [(path, obj, None)]
+        while stack:
+            path, obj, iobject = stack.pop()
+            if obj is not None:
+                iobject = obj.iobject
+            yield path, obj, iobject
+            prefix = path.rstrip("/") + "/"
+            children = []
+            child_dict = obj._child_dict if obj is not None else None
+            if child_dict is not None and (child_dict.visited or not iobject):
+                for name, child in list(dict.items(child_dict)):
+                    if child is _UNLOADED:
+                        children.append(
+                            (prefix + name, None, iobject.getChild(name)))
+                    else:
+                        children.append((prefix + name, child, None))
+            elif iobject:
+                for i in range(iobject.getNumChildren()):
+                    child_path = prefix + iobject.getChildHeader(i).getName()
+                    if self._path_filter is None or \
+                            self._path_filter(child_path):
+                        children.append(
+                            (child_path, None, iobject.getChild(i)))
+            stack.extend(reversed(children))
+
+    @property
+    def query_index(self):
+        """QueryIndex of the objects by type, metadata and property paths.
+        It is built in one pass over the object and property headers the
+        first time it is accessed, and is rebuilt after objects or
+        properties are added, removed, renamed or moved. Wrapped objects
+        are indexed as they are, unwrapped ones from their headers.
+        """
+        self.__check_index()
+        if self._query_index is None:
+            index = QueryIndex()
+            for path, obj, iobject in self.__walk():
+                if obj is not None:
+                    index.add(path, obj.type(), obj.metadata,
+                              _property_paths(obj))
+                else:
+                    index.add(path, _object_class(iobject).__name__,
+                              _metadata_dict(iobject.getMetaData()),
+                              _iproperty_paths(iobject.getProperties()))
+            self._query_index = index
+        return self._query_index
+
+    def query(self, types=None, schema=None, metadata=None, properties=None):
+        """Returns the Objects matching all the given conditions, looked up
+        in the query_index, sorted by path. ::
+
+            >>> a.query(types=["PolyMesh"], metadata={"units": None})
+            [<PolyMesh "mesh">]
+
+        :param types: Class type inclusion list
+        :param schema: Schema name, or list of schema names, to match
+        :param metadata: Metadata keys, or dict of key values, to match.
+            A value of None matches any value.
+        :param properties: Relative property paths the objects must have
+        :return: List of Objects
+        """
+        return [self.get(path) for path in self.query_index.query(
+            types, schema, metadata, properties)]
+
+    def __get_xform_plan(self):
+        """Returns the objects of the hierarchy in depth-first order, as
+        lists of path, parent slot, IXformSchema or None, whether the
+        world matrix is constant, and the cached constant world matrix.
+        """
+        self.__check_index()
+        if self._xform_plan is None:
+            plan = []
+            slots = {}
+            for path, obj, iobject in self.__walk():
+                if path == "/":
+                    continue
+                parent = slots.get(path.rsplit("/", 1)[0], -1)
+                schema = None
+                if iobject:
+                    if obj is not None:
+                        if obj.type() == "Xform":
+                            schema = obj.schema
+                    elif _object_class(iobject) is Xform:
+                        schema = alembic.AbcGeom.IXform(
+                            iobject.getParent(), iobject.getName()
+                        ).getSchema()
+                constant = schema is None or schema.isConstant()
+                if parent >= 0:
+                    constant = constant and plan[parent][3]
+                slots[path] = len(plan)
+                plan.append([path, parent, schema, constant, None])
+            self._xform_plan = plan
+        return self._xform_plan
+
+    def world_matrices(self, frame=None, time=None, as_array=False):
+        """Returns the world space matrices of all the objects at a given
+        frame or time, evaluated top-down in one pass. ::
+
+            >>> a.world_matrices(frame=1001)["/root/geo/mesh"]
+            M44d(...)
+
+        Objects that are not Xforms share the matrix of their parent.
+        Matrices are read from the archive, and the world matrices of
+        objects without animated Xforms above them are cached between
+        calls, until the hierarchy changes.
+
+        :param frame: frame number
+        :param time: time in seconds
+        :param as_array: Return a list of paths and a (N, 4, 4) NumPy array
+            instead of a dict
+        :return: OrderedDict of full paths to M44d, or (paths, ndarray)
+        """
+        if time is None and frame is not None:
+            time = frame / float(self.fps)
+        plan = self.__get_xform_plan()
+        worlds = []
+        for path, parent, schema, constant, cached in plan:
+            if cached is not None:
+                worlds.append(cached)
+                continue
+            if parent >= 0:
+                world = worlds[parent]
+            else:
+                world = imath.M44d()
+                world.makeIdentity()
+            if schema is not None:
+                index = 0
+                if time is not None and not schema.isConstant():
+                    index = schema.getTimeSampling().getNearIndex(
+                        float(time), schema.getNumSamples())
+                sample = schema.getValue(index)
+                if sample.getInheritsXforms():
+                    world = sample.getMatrix() * world
+                else:
+                    world = sample.getMatrix()
+            worlds.append(world)
+            if constant:
+                plan[len(worlds) - 1][4] = world
+        if as_array:
+            matrices = imath.M44dArray(len(worlds))
+            for i, world in enumerate(worlds):
+                matrices[i] = world
+            return [entry[0] for entry in plan], imath_to_numpy(matrices)
+        return OrderedDict(
+            (entry[0], imath.M44d(world)) for entry, world in zip(plan, worlds)
+        )
+
+    def shutter_samples(self, frame, open=-0.25, close=0.25, paths=None):
+        """Returns the samples of each object needed to motion blur a
+        frame: the samples between frame + open and frame + close, and the
+        samples at or before the open and at or after the close, so that
+        the whole shutter interval can be interpolated. ::
+
+            >>> times, matrices = a.shutter_samples(1001)["/root/cam"]
+
+        Sample indices are resolved once per time sampling and number of
+        samples, and samples are read through the archive sample cache,
+        once per object and index. Values are M44d matrices for Xforms and
+        schema samples for other objects.
+
+        :param frame: frame number
+        :param open: shutter open, in frames relative to the frame
+        :param close: shutter close, in frames relative to the frame
+        Objects whose schema has no samples, like Materials and Lights,
+        are skipped.
+
+        :param paths: full object paths, or None for all the Xforms,
+            Cameras and geometry objects
+        :return: OrderedDict of full paths to lists of sample times in
+            seconds and lists of values
+        """
+        fps = float(self.fps)
+        start = (frame + open) / fps
+        end = (frame + close) / fps
+        if paths is None:
+            sampled = (Xform, PolyMesh, SubD, FaceSet, Curve, Camera,
+                       NuPatch, Points)
+            paths = [
+                path for path, entry in self.index.items()
+                if entry.header is not None and
+                _object_class(entry.header) in sampled
+            ]
+        table = self.time_sampling_table
+        windows = {}
+        results = OrderedDict()
+        for path in paths:
+            if path in results:
+                continue
+            obj = self.get(path)
+            schema = obj.schema
+            if schema is None or not hasattr(schema, "getValue") or \
+                    not hasattr(schema, "getTimeSampling"):
+                continue
+            ts = schema.getTimeSampling()
+            num_samples = schema.getNumSamples()
+            tsid = table.find(ts)
+            window = windows.get((tsid, num_samples))
+            if window is None:
+                first = _sample_bracket(ts, num_samples, start)[0]
+                last = _sample_bracket(ts, num_samples, end)[1]
+                indices = range(first, max(first, last) + 1)
+                if num_samples == 0:
+                    indices = range(0)
+                window = ([ts.getSampleTime(i) for i in indices], indices)
+                if tsid is not None:
+                    windows[(tsid, num_samples)] = window
+            times, indices = window
+            samples = obj.samples
+            if obj.type() == "Xform":
+                values = [samples[i].getMatrix() for i in indices]
+            else:
+                values = [samples[i] for i in indices]
+            results[path] = (list(times), values)
+        return results
+
+    def get(self, path):
+        """Returns the Object or Property at a full path. Only the objects
+        along the path are wrapped, and objects are looked up in the index
+        once they have been found. ::
+
+            >>> a.get("/root/world/geo/mesh/.geom/P")
+            <Property "P">
+
+        :param path: full path of an object or property.
+        :raises KeyError: if nothing exists at the path.
+        """
+        self.__check_index()
+        names = [name for name in path.split("/") if name]
+        entry = self._index.get("/" + "/".join(names))
+        if entry is not None and entry.item is not None:
+            return entry.item
+        item = self.top
+        obj_path = ""
+        for i, name in enumerate(names):
+            obj_path += "/" + name
+            entry = self._index.get(obj_path)
+            if entry is not None and entry.item is not None:
+                item = entry.item
+                continue
+            child = item.children.get(name)
+            if child is None:
+                return item.properties["/".join(names[i:])]
+            if entry is None:
+                header = child.iobject.getHeader() if child.iobject else None
+                self._index[obj_path] = IndexEntry(obj_path, header, child)
+            else:
+                entry.item = child
+            item = child
+        return item
+
     def close(self):
         """Closes this archive and makes it immutable."""
         def close_tree(obj):
             """recursive close"""
-            for child in obj.children.values():
+            for child in _loaded_values(obj._child_dict):
                 close_tree(child)
                 del child
             obj.close()
             del obj
 
-        for child in self.top.children.values():
+        for child in _loaded_values(self.top._child_dict):
             close_tree(child)
             del child
 
+        self.sample_cache.clear()
+        self._index = {}
+        self._index_complete = False
+        self._index_pending = []
+        self._query_index = None
+        self._xform_plan = None
+        self.__read_time_samplings = None
+        self.__time_sampling_table = None
+        self._hierarchy_version += 1
         self._iobject = None
         self._oobject = None
         self._top._iobject = None
         self._top._oobject = None
         self._top._parent = None
-        self._top._child_dict.clear()
-        self._top._prop_dict.clear()
+        self._top._child_dict = None
+        self._top._prop_dict = None
 
     def __write(self):
         """Recursively calls save() on object hierarchy. Normally, you will
@@ -754,23 +2774,54 @@ class Archive(object):
         """
         if not self.oobject:
             raise ValueError("No output filepath specified")
-        self.top.save()
-        def save_tree(obj):
-            """recursive save"""
-            obj.save()
-            for child in obj.children.values():
-                save_tree(child)
-                child.close()
+        path_filter = self._path_filter
+        def save_children(obj):
+            """recursive save, copying unchanged sub-trees as they are"""
+            prefix = obj.path().rstrip("/") + "/"
+            for name, child in list(dict.items(obj.children)):
+                if child is _UNLOADED:
+                    _copy_iobject(obj.iobject.getChild(name), obj.oobject,
+                                  obj.time_sampling_id, path_filter,
+                                  prefix + name)
+                elif child.iobject and not child.is_dirty():
+                    _copy_iobject(child.iobject, obj.oobject,
+                                  child.time_sampling_id, path_filter,
+                                  prefix + name)
+                else:
+                    child.save()
+                    save_children(child)
                 del child
-            obj.close()
-            del obj
-        for child in self.top.children.values():
-            save_tree(child)
-        self.top.close()
+        self.top.save()
+        save_children(self.top)
+
+    def __release(self):
+        """Releases the internal OArchive and all of the O-objects and
+        O-properties in the hierarchy, which finishes writing the file.
+        """
+        def release_tree(item):
+            """recursive release"""
+            item._oobject = None
+            for prop in _loaded_values(item._prop_dict):
+                release_tree(prop)
+            if isinstance(item, Object):
+                for child in _loaded_values(item._child_dict):
+                    release_tree(child)
+        release_tree(self.top)
+        self._oobject = None
+
+    def is_dirty(self):
+        """Returns True if anything in the hierarchy has been changed
+        since it was read.
+        """
+        return self.top.is_dirty()
 
-    # TODO: non-destructive saving (changes are lost)
     def write_to_file(self, filepath=None, asOgawa=True, userDescription=""):
-        """Writes this archive to a file on disk and closes the Archive.
+        """Writes this archive to a file on disk. Objects and properties
+        that have not been changed are copied from the source archive as
+        they are, without being read into Python.
+
+        The Archive stays open afterwards, and can be edited and written
+        again.
         """
         smps = []
         # look for timesampling data on the iarchive first
@@ -783,34 +2834,478 @@ class Archive(object):
             self.time_sampling_id = 1
         # create the oarchive
         if not self.oobject:
-            # support for Ogawa archives via CreateArchiveWithInfo
-            # came in Alembic 1.5.7
-            m1, m2, m3 = (int(m) for m in self.using_version().split("."))
-            if m1 == 1 and m2 <= 5 and m3 < 7:
-                self.oobject = alembic.Abc.OArchive(filepath, asOgawa=asOgawa)
-            else:
-                if self.top.iobject:
-                    md = self.top.iobject.getMetaData()
-                else:
-                    md = alembic.AbcCoreAbstract.MetaData()
-                for k, v in self.top.metadata.items():
-                    md.set(k, v)
-                self.oobject = alembic.Abc.CreateArchiveWithInfo(
-                    filepath,
-                    "cask %s" % __version__,
-                    str(userDescription),
-                    md, 1
-                )
-            self.top.oobject = self.oobject.getTop()
+            if not filepath:
+                raise ValueError("No output filepath specified")
+            self._create_oarchive(filepath, asOgawa, userDescription)
         # set timesampling objects on the oarchive
         for i, time_sample in smps:
             self.oobject.addTimeSampling(time_sample)
-        self.__write()
+        try:
+            self.__write()
+        finally:
+            self.__release()
+
+    def _create_oarchive(self, filepath, asOgawa=True, userDescription=""):
+        """Creates the internal OArchive object and sets the OObject on Top.
+        """
+        # support for Ogawa archives via CreateArchiveWithInfo
+        # came in Alembic 1.5.7
+        m1, m2, m3 = (int(m) for m in self.using_version().split("."))
+        if m1 == 1 and m2 <= 5 and m3 < 7:
+            self.oobject = alembic.Abc.OArchive(filepath, asOgawa=asOgawa)
+        else:
+            if self.top.iobject:
+                md = self.top.iobject.getMetaData()
+            else:
+                md = alembic.AbcCoreAbstract.MetaData()
+            for k, v in self.top.metadata.items():
+                md.set(k, v)
+            self.oobject = alembic.Abc.CreateArchiveWithInfo(
+                filepath,
+                "cask %s" % __version__,
+                str(userDescription),
+                md, 1
+            )
+        self.top.oobject = self.oobject.getTop()
+
+
+class ArchiveWriter(object):
+    """Streaming archive writer. The hierarchy is declared once on `top`,
+    then samples are written one frame at a time straight to the
+    underlying Alembic O-objects and O-properties, so only a single frame
+    of data is held in memory. ::
+
+        >>> with cask.ArchiveWriter("sim.abc", fps=24) as writer:
+        ...     xform = writer.top.children["particles"] = cask.Xform()
+        ...     xform.properties[".xform/.userProperties/age"] = cask.Property()
+        ...     for frame in range(100):
+        ...         writer.write_frame({
+        ...             "/particles": xform_samples[frame],
+        ...             "/particles/.xform/.userProperties/age": ages[frame],
+        ...         })
+
+    Object paths take schema samples, like `Object.set_sample`, property
+    paths take values, like `Property.set_value`. Property types are
+    inferred from the first value written, and properties that were not
+    declared are created on their object. Values already set on the
+    declared hierarchy are written once when the archive is opened.
+    """
+    def __init__(self, filepath, fps=24, start_frame=0, asOgawa=True,
+                 userDescription=""):
+        """
+        :param filepath: path of the archive to write.
+        :param fps: frames per second.
+        :param start_frame: frame number of the first frame written.
+        :param asOgawa: write an Ogawa archive (otherwise HDF5).
+        :param userDescription: description stored in the archive info.
+        """
+        super(ArchiveWriter, self).__init__()
+        self.filepath = filepath
+        self.start_frame = start_frame
+        self.num_frames = 0
+        self.archive = Archive(fps=fps)
+        self._asOgawa = asOgawa
+        self._userDescription = userDescription
+        self._items = {}
+        self._closed = False
+
+    def __repr__(self):
+        return '<ArchiveWriter "%s">' % self.filepath
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
         self.close()
 
+    @property
+    def top(self):
+        """Hierarchy root to declare objects and properties on."""
+        return self.archive.top
+
+    @property
+    def fps(self):
+        """Frames per second."""
+        return self.archive.fps
+
+    def is_open(self):
+        """Returns True if the output archive has been created."""
+        return self.archive.oobject is not None
+
+    def open(self):
+        """Creates the output archive, and the OObjects of the declared
+        hierarchy. Called by the first `write_frame`, after which no more
+        objects should be added.
+        """
+        if self._closed:
+            raise ValueError("Writer is closed: %s" % self.filepath)
+        if self.is_open():
+            return
+        archive = self.archive
+        archive._create_oarchive(self.filepath, self._asOgawa,
+                                 self._userDescription)
+        archive.oobject.addTimeSampling(alembic.AbcCoreAbstract.TimeSampling(
+            1 / float(self.fps), self.start_frame / float(self.fps)))
+        archive.time_sampling_id = archive.oobject.getNumTimeSamplings() - 1
+        for prop in archive.top.properties.values():
+            self.__open_property(prop)
+        for child in archive.top.children.values():
+            self.__open_object(child)
+
+    def __open_object(self, obj):
+        """Creates the OObject and writes any samples already set."""
+        obj.oobject
+        for prop in obj.properties.values():
+            self.__open_property(prop)
+        for sample in obj._osamples:
+            obj._write_sample(sample)
+        for child in obj.children.values():
+            self.__open_object(child)
+
+    def __open_property(self, prop):
+        """Writes any values already set on a declared property."""
+        if not prop.iobject and prop.time_sampling_id == 0:
+            prop.time_sampling_id = self.archive.time_sampling_id
+        for child in prop.properties.values():
+            self.__open_property(child)
+        if not prop.is_compound() and len(prop.values) > 0:
+            for value in prop.values:
+                prop._write_value(value)
+
+    def __resolve(self, path):
+        """Returns the Object or Property at a given path. Properties that
+        were not declared are created on existing objects.
+        """
+        item = self.archive.top
+        names = [name for name in path.split("/") if name]
+        for i, name in enumerate(names):
+            if name not in item.children:
+                name = "/".join(names[i:])
+                try:
+                    return item.properties[name]
+                except KeyError:
+                    item.properties[name] = Property()
+                    return item.properties[name]
+            item = item.children[name]
+        return item
+
+    def __write(self, item, value):
+        """Writes the next sample of an Object or Property."""
+        if isinstance(item, Object):
+            if item._sample_class and not isinstance(value, item._sample_class):
+                raise TypeError("Can not set %s on %s object"
+                                % (value.__class__.__name__, item.type()))
+            item._write_sample(value)
+            return
+        if item.is_compound():
+            raise TypeError(_COMPOUND_PROPERTY_VALUE_ERROR_)
+        value = _delist(value)
+        if item._oobject is None:
+            if not item.iobject and item.time_sampling_id == 0:
+                item.time_sampling_id = self.archive.time_sampling_id
+            # infer the property type from the first value
+            values, item._values = item._values, [value]
+            try:
+                oobject = item.oobject
+            finally:
+                item._values = values
+            if oobject is None:
+                raise ValueError("Can not write property: %s" % item.path())
+        item._write_value(value)
+
+    def __write_previous(self, path, item):
+        """Repeats the previous sample of an Object or Property."""
+        oobject = item.oobject
+        if isinstance(item, Object):
+            oobject = oobject.getSchema()
+        set_from_previous = getattr(oobject, "setFromPrevious", None)
+        if set_from_previous is None:
+            raise ValueError("%s must be written on every frame" % path)
+        set_from_previous()
+
+    def write_frame(self, values):
+        """Writes the next frame of samples.
+
+        :param values: dict of {path: value}. Paths written on an earlier
+            frame but missing here repeat their previous sample.
+        """
+        self.open()
+        values = dict(("/" + path.strip("/"), value)
+                      for path, value in values.items())
+        for path, value in values.items():
+            item = self._items.get(path)
+            if item is not None:
+                self.__write(item, value)
+                continue
+            item = self.__resolve(path)
+            # back-fill paths first written after the first frame, so
+            # their samples line up with the time sampling
+            for i in range(self.num_frames + 1):
+                self.__write(item, value)
+            self._items[path] = item
+        for path, item in self._items.items():
+            if path not in values:
+                self.__write_previous(path, item)
+        self.num_frames += 1
+
+    def close(self):
+        """Finishes writing the archive and closes it."""
+        if self._closed:
+            return
+        self.open()
+        def close_tree(obj):
+            """recursive default samples and close"""
+            if obj.path() not in self._items and not obj._osamples:
+                obj._set_default_sample()
+                for sample in obj._osamples:
+                    obj._write_sample(sample)
+            for child in obj.children.values():
+                close_tree(child)
+            for prop in obj.properties.values():
+                prop.close()
+            obj.close()
+        for child in self.archive.top.children.values():
+            close_tree(child)
+        for prop in self.archive.top.properties.values():
+            prop.close()
+        self._items.clear()
+        self.archive.close()
+        self._closed = True
+
+
+class ArchiveView(object):
+    """Read-only view of the object hierarchy of an archive, for bulk
+    queries over large archives. ::
+
+        >>> view = cask.ArchiveView("shot.abc")
+        >>> for node in view.find(types=["PolyMesh"]):
+        ...     print(view.path(node), view.get_value(node, ".geom/P"))
+
+    Objects are stored as nodes in flat arrays, in breadth-first order,
+    so the children of a node are contiguous and come after it. Nodes are
+    integer indices, node 0 is the top object. Nothing is wrapped and the
+    hierarchy can not be changed.
+
+    The arrays are public, for use with NumPy: ``parents``, ``depths``,
+    ``first_children``, ``child_counts``, ``type_codes`` (indices into
+    ``type_names``), ``property_counts`` and ``sample_counts``, which is
+    -1 for nodes whose samples have not been counted yet.
+    """
+    def __init__(self, filepath, fps=24):
+        """
+        :param filepath: Path to Alembic archive file.
+        :param fps: Frames per second (default 24).
+        """
+        if not os.path.isfile(filepath):
+            raise RuntimeError("Nonexistent file: %s" % filepath)
+        self.filepath = filepath
+        self.fps = fps
+        self.parents = array.array("l", [-1])
+        self.depths = array.array("l", [0])
+        self.first_children = array.array("l")
+        self.child_counts = array.array("l")
+        self.type_codes = array.array("B")
+        self.type_names = []
+        self.property_counts = array.array("l")
+        self._iarchive = alembic.Abc.IArchive(filepath)
+        self._iobjects = {0: self._iarchive.getTop()}
+        self.__read_hierarchy()
+        self.sample_counts = array.array("l", [-1]) * len(self)
+
+    def __repr__(self):
+        return '<%s "%s">' % (self.__class__.__name__, self.filepath)
+
+    def __len__(self):
+        return len(self.parents)
+
+    def __read_hierarchy(self):
+        """Fills the arrays, one level of the hierarchy at a time."""
+        names = ["ABC"]
+        codes = {}
+        node = 0
+        level = [self._iobjects[0]]
+        while level:
+            next_level = []
+            for iobject in level:
+                type_name = "Top" if node == 0 else \
+                    _object_class(iobject).__name__
+                code = codes.get(type_name)
+                if code is None:
+                    code = codes[type_name] = len(self.type_names)
+                    self.type_names.append(type_name)
+                self.type_codes.append(code)
+                self.property_counts.append(
+                    iobject.getProperties().getNumProperties())
+                count = iobject.getNumChildren()
+                self.first_children.append(len(names))
+                self.child_counts.append(count)
+                depth = self.depths[node] + 1
+                for i in range(count):
+                    child = iobject.getChild(i)
+                    names.append(child.getName())
+                    self.parents.append(node)
+                    self.depths.append(depth)
+                    next_level.append(child)
+                node += 1
+            level = next_level
+        self._names = "".join(names)
+        self._name_offsets = array.array("l", [0])
+        offset = 0
+        for name in names:
+            offset += len(name)
+            self._name_offsets.append(offset)
+
+    def name(self, node):
+        """Returns the name of a node."""
+        return self._names[self._name_offsets[node]:self._name_offsets[node + 1]]
+
+    def type(self, node):
+        """Returns the cask type name of a node, e.g. "PolyMesh"."""
+        return self.type_names[self.type_codes[node]]
+
+    def parent(self, node):
+        """Returns the parent node of a node, or -1 for the top node."""
+        return self.parents[node]
+
+    def children(self, node):
+        """Returns the range of child nodes of a node."""
+        first = self.first_children[node]
+        return range(first, first + self.child_counts[node])
+
+    def path(self, node):
+        """Returns the full path of a node."""
+        names = []
+        while node > 0:
+            names.append(self.name(node))
+            node = self.parents[node]
+        return "/" + "/".join(reversed(names))
+
+    def node(self, path):
+        """Returns the node at a full object path.
+
+        :raises KeyError: if there is no object at the path.
+        """
+        node = 0
+        for name in path.split("/"):
+            if not name:
+                continue
+            for child in self.children(node):
+                if self.name(child) == name:
+                    node = child
+                    break
+            else:
+                raise KeyError(path)
+        return node
+
+    def iobject(self, node):
+        """Returns the Alembic IObject of a node."""
+        iobject = self._iobjects.get(node)
+        if iobject is None:
+            parent = self.iobject(self.parents[node])
+            iobject = self._iobjects[node] = parent.getChild(self.name(node))
+        return iobject
+
+    def num_samples(self, node):
+        """Returns the number of schema samples of a node, or 0 for objects
+        without a schema."""
+        count = self.sample_counts[node]
+        if count < 0:
+            count = 0
+            klass = IOBJECTS.get(self.type(node))
+            if klass is not None:
+                iobject = self.iobject(node)
+                count = klass(iobject.getParent(), iobject.getName()
+                              ).getSchema().getNumSamples()
+            self.sample_counts[node] = count
+        return count
+
+    def find(self, name=".*", types=None, path=None, max_depth=None,
+             limit=None):
+        """Returns the nodes with names matching a given regular
+        expression, in breadth-first order. ::
+
+            >>> [view.path(n) for n in view.find(types=["Camera"])]
+            ['/root/cam/shotCam']
+
+        :param name: Regular expression to match object name
+        :param types: Class type inclusion list
+        :param path: Glob pattern to match the full object path
+        :param max_depth: Maximum depth to search
+        :param limit: Maximum number of results
+        :return: List of nodes
+        """
+        regex = re.compile(name)
+        codes = None
+        if types is not None:
+            codes = set(i for i, t in enumerate(self.type_names) if t in types)
+        parts = None
+        states = None
+        if path is not None:
+            parts = _compile_path_glob(path)
+            states = [_path_glob_states(parts, "/")]
+        results = []
+        if limit is not None and limit <= 0:
+            return results
+        for node in range(len(self)):
+            if max_depth is not None and self.depths[node] > max_depth:
+                break
+            if states is not None and node > 0:
+                parent_states = states[self.parents[node]]
+                states.append(parent_states and _advance_path_glob(
+                    parts, parent_states, self.name(node)))
+            if codes is not None and self.type_codes[node] not in codes:
+                continue
+            if states is not None and len(parts) not in states[node]:
+                continue
+            if not regex.match(self.name(node)):
+                continue
+            results.append(node)
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+    def get_value(self, node, prop_path, index=None, time=None, frame=None):
+        """Returns the value of a property of a node for a given sample
+        index, time or frame. If none are provided, returns the 0th value.
+
+        :param node: Node, or full object path
+        :param prop_path: Relative property path, e.g. ".geom/P"
+        :param index: sample index
+        :param time: time in seconds
+        :param frame: frame number
+        :raises KeyError: if the property does not exist.
+        """
+        if not isinstance(node, int):
+            node = self.node(node)
+        iprop = self.iobject(node).getProperties()
+        for name in prop_path.strip("/").split("/"):
+            if not iprop.isCompound() or not iprop.getPropertyHeader(name):
+                raise KeyError(prop_path)
+            iprop = iprop.getProperty(name)
+        if iprop.isCompound():
+            raise TypeError(_COMPOUND_PROPERTY_VALUE_ERROR_)
+        if index is None:
+            index = 0
+            if time is None and frame is not None:
+                time = frame / float(self.fps)
+            if time is not None:
+                index = iprop.getTimeSampling().getNearIndex(
+                    float(time), iprop.getNumSamples())
+        return iprop.getValue(index)
+
+    def close(self):
+        """Releases the internal IArchive and IObjects."""
+        self._iobjects = {}
+        self._iarchive = None
+
 
 class Property(object):
     """Property I/O Object."""
+    __slots__ = ("id", "_parent", "_name", "_metadata", "_datatype",
+                 "_iobject", "_oobject", "_klass", "_values", "_path",
+                 "_prop_dict", "_dirty", "_sampling", "_bracket",
+                 "time_sampling_id")
+
     def __init__(self, iproperty=None, time_sampling_id=0, name=None, klass=None):
         """
         :param iproperty: Alembic IProperty class object.
@@ -824,18 +3319,22 @@ class Property(object):
         # init some private variables
         self._parent = None
         self._name = name
-        self._metadata = {}
+        self._metadata = None
         self._datatype = None
         self._iobject = iproperty
         self._oobject = None
         self._klass = klass
-        self._values = []
-        self._prop_dict = DeepDict(self, Property)
+        self._values = ()
+        self._path = None
+        self._prop_dict = None
+        self._sampling = None
+        self._bracket = None
         self.time_sampling_id = time_sampling_id
 
         # if we have an iproperty, get some values from it
         if iproperty:
             self.__read_property(iproperty)
+        self._dirty = False
 
     def __repr__(self):
         return '<Property "%s">' % self.name
@@ -858,8 +3357,6 @@ class Property(object):
                        doc="Internal Alembic IProperty object.")
 
     def __get_oobject(self):
-        parent = None
-
         if not self._oobject and self.parent:
             if self.iobject:
                 meta = self.iobject.getMetaData()
@@ -871,11 +3368,11 @@ class Property(object):
                 self._klass = get_simple_oprop_class(self)
             if self.is_compound() and self.iobject:
                 meta.set('schema', self.iobject.getMetaData().get('schema'))
-            if type(self.parent) == Property and self.parent.is_compound():
-                parent = self.parent.oobject
-            else:
-                if hasattr(self.parent.oobject, 'getProperties'):
-                    parent = self.parent.oobject.getProperties()
+            schema = self._oschema()
+            if schema and self.name == ".childBnds":
+                self._oobject = schema.getChildBoundsProperty()
+                return self._oobject
+            parent = self._oparent()
             if parent and parent.getPropertyHeader(self.name):
                 # pre-existing property exists, see Property.__get_oobject
                 pass
@@ -896,6 +3393,32 @@ class Property(object):
     oobject = property(__get_oobject, __set_oobject,
                        doc="Internal Alembic OProperty object.")
 
+    def _oschema(self):
+        """Returns the OSchema of the object this property belongs to, if
+        both are new, i.e. the schema creates some of their properties.
+        """
+        obj = self.object()
+        if self.iobject or obj is None or obj.iobject:
+            return None
+        get_schema = getattr(obj.oobject, "getSchema", None)
+        return get_schema() if get_schema else None
+
+    def _oparent(self):
+        """Returns the OCompoundProperty this property is written to."""
+        parent = self.parent
+        schema = self._oschema()
+        if schema and type(parent) == Property:
+            # user and arbGeom params of new objects belong to the schema
+            if parent.name == ".userProperties":
+                return schema.getUserProperties()
+            elif parent.name == ".arbGeomParams":
+                return schema.getArbGeomParams()
+        if type(parent) == Property and parent.is_compound():
+            return parent.oobject
+        elif hasattr(parent.oobject, 'getProperties'):
+            return parent.oobject.getProperties()
+        return None
+
     def is_scalar(self):
         if not self._klass:
             self._klass = get_simple_oprop_class(self)
@@ -910,7 +3433,11 @@ class Property(object):
         return self._parent
 
     def __set_parent(self, parent):
-        self._parent = parent
+        if parent is not self._parent:
+            _metadata_changed(self._parent)
+            self._parent = parent
+            _clear_paths(self)
+            _metadata_changed(parent)
 
     parent = property(__get_parent, __set_parent,
                       doc="Parent object or property.")
@@ -926,6 +3453,10 @@ class Property(object):
     def __set_name(self, name):
         old = self._name
         self._name = name
+        if old is not None and old != name:
+            self._dirty = True
+            _clear_paths(self)
+            _metadata_changed(self)
         if self._parent and hasattr(self._parent, "_prop_dict"):
             if old and old in self.parent.properties:
                 self._parent.properties.remove(old)
@@ -935,17 +3466,16 @@ class Property(object):
                     doc="Gets and sets the property name.")
 
     def __get_metadata(self):
-        if not self._metadata and self.iobject:
-            meta = self.iobject.getMetaData()
-            for field in meta.serialize().split(';'):
-                splits = field.split('=')
-                key = splits[0]
-                value = '='.join(splits[1:])
-                self._metadata[key] = value
+        if not self._metadata:
+            if self.iobject:
+                self._metadata = _metadata_dict(self.iobject.getMetaData())
+            elif self._metadata is None:
+                self._metadata = {}
         return self._metadata
 
     def __set_metadata(self, metadata):
         self._metadata = metadata
+        self._dirty = True
 
     metadata = property(__get_metadata, __set_metadata,
                         doc="Metadata as a dict.")
@@ -964,6 +3494,7 @@ class Property(object):
 
     def __set_datatype(self, datatype):
         self._datatype = datatype
+        self._dirty = True
 
     datatype = property(__get_datatype, __set_datatype,
                         doc="DataType object.")
@@ -991,12 +3522,11 @@ class Property(object):
 
     def path(self):
         """Returns the full path/name of this property."""
-        path = [""]
-        obj = self
-        while obj and obj.type() != "Top":
-            path.insert(1, obj.name)
-            obj = obj.parent
-        return "/".join(path)
+        if self._path is None:
+            parent = self.parent
+            prefix = parent.path().rstrip("/") if parent else ""
+            self._path = prefix + "/" + self.name
+        return self._path
 
     def object(self):
         """Returns the object parent for this property."""
@@ -1022,22 +3552,37 @@ class Property(object):
         if iproperty:
             self.iobject = iproperty
             self.name = iproperty.getName()
-        if iproperty.isCompound():
-            for i in range(self.iobject.getNumProperties()):
-                self.add_property(Property(
-                        iproperty = iproperty.getProperty(i),
-                        time_sampling_id = self.time_sampling_id
-                    )
-                 )
 
     @property
     def properties(self):
-        """Child properties accessor."""
+        """Child properties accessor. Sub-properties are read from the
+        property headers, and each is only wrapped when it is accessed.
+        """
+        if self._prop_dict is None:
+            self._prop_dict = DeepDict(self, Property)
+        if not self._prop_dict.visited and self.iobject and \
+                self.iobject.isCompound():
+            iprop = self.iobject
+            for i in range(iprop.getNumProperties()):
+                name = iprop.getPropertyHeader(i).getName()
+                if name not in self._prop_dict:
+                    self._prop_dict._add_unloaded(name)
+            self._prop_dict.visited = True
         return self._prop_dict
 
+    def _wrap_property(self, name):
+        """Wraps the sub-property IProperty with a given name."""
+        return Property(
+            iproperty = self.iobject.getProperty(name),
+            time_sampling_id = self.time_sampling_id
+        )
+
     def is_leaf(self):
         """Returns True if this property is a leaf node, i.e. it has no sub-properties.
         """
+        if self._prop_dict is None and \
+                not (self.iobject and self.iobject.isCompound()):
+            return True
         return len(self.properties) == 0
 
     def is_compound(self):
@@ -1048,7 +3593,88 @@ class Property(object):
         """
         if self.iobject:
             return self.iobject.isCompound()
-        return len(self.properties) > 0
+        return bool(self._prop_dict)
+
+    def is_dirty(self):
+        """Returns True if this property is new, or its values, metadata,
+        name or sub-properties have been changed since it was read.
+        """
+        if self._dirty or not self.iobject:
+            return True
+        if isinstance(self._values, SampleList) and self._values.modified:
+            return True
+        if self._metadata and \
+                self._metadata != _metadata_dict(self.iobject.getMetaData()):
+            return True
+        for prop in _loaded_values(self._prop_dict):
+            if prop.is_dirty():
+                return True
+        return False
+
+    def __get_sampling(self):
+        """Returns the archive, index in the archive time sampling table and
+        number of samples of a property read from an archive, cached until
+        the property is moved. Returns None for new properties.
+        """
+        if self._sampling is None:
+            archive = self.archive() if self.iobject else None
+            if archive is None:
+                return None
+            tsid = archive.time_sampling_table.find(
+                self.iobject.getTimeSampling())
+            if tsid is None:
+                return None
+            self._sampling = (archive, tsid, self.iobject.getNumSamples())
+        return self._sampling
+
+    def sample_indices(self, frames=None, times=None):
+        """Returns a list of the sample indices nearest to a list of frames
+        or times, mapped in one pass. ::
+
+            >>> p.sample_indices(frames=range(1001, 1005))
+            [0, 1, 2, 3]
+
+        :param frames: list of frame numbers
+        :param times: list of times in seconds
+        """
+        if self.is_compound():
+            raise TypeError(_COMPOUND_PROPERTY_VALUE_ERROR_)
+        sampling = self.__get_sampling()
+        if sampling is None:
+            if times is not None:
+                return [self.__get_sample_index(time=t) for t in times]
+            return [self.__get_sample_index(frame=f) for f in frames]
+        archive, tsid, num_samples = sampling
+        if times is None:
+            fps = float(archive.fps)
+            times = [frame / fps for frame in frames]
+        return archive.time_sampling_table.near_indices(
+            tsid, num_samples, times)
+
+    def get_values(self, indices=None, frames=None, times=None):
+        """Returns a list of the values for a list of sample indices, frames
+        or times, or all the values if none are given. Each sample is only
+        read once. ::
+
+            >>> p.get_values(frames=range(1001, 1101))
+
+        :param indices: list of sample indices
+        :param frames: list of frame numbers
+        :param times: list of times in seconds
+        """
+        if self.is_compound():
+            raise TypeError(_COMPOUND_PROPERTY_VALUE_ERROR_)
+        if indices is None:
+            if frames is None and times is None:
+                indices = range(len(self.values))
+            else:
+                indices = self.sample_indices(frames=frames, times=times)
+        values = self.values
+        read = {}
+        for index in indices:
+            if index not in read:
+                read[index] = values[index]
+        return [read[index] for index in indices]
 
     def __get_sample_index(self, time=None, frame=None):
         """Converts time in secs or frame number to sample index.
@@ -1057,8 +3683,17 @@ class Property(object):
         :param frame: frame number.
         :return: sample index.
         """
-        if len(self.properties) > 0:
+        if self.is_compound():
             raise TypeError(_COMPOUND_PROPERTY_VALUE_ERROR_)
+        sampling = self.__get_sampling()
+        if sampling is not None:
+            archive, tsid, num_samples = sampling
+            if time is None and frame is not None:
+                time = frame / float(archive.fps)
+            if time is None:
+                return 0
+            return archive.time_sampling_table.near_index(
+                tsid, num_samples, time)
         if self.iobject:
             ts = self.iobject.getTimeSampling()
             numSamples = self.iobject.getNumSamples()
@@ -1075,32 +3710,51 @@ class Property(object):
 
     @property
     def values(self):
-        """Returns dictionary of values stored on this property.
+        """Returns the list of values stored on this property. Values read
+        from an archive are returned as a lazy SampleList, which only reads
+        the samples that are accessed.
         """
         if not self.is_compound() and not self._values and self.iobject:
-            for i in range(len(self.iobject.samples)):
-                try:
-                    self._values.insert(i, self.iobject.samples[i])
-                except RuntimeError as err:
-                    print("Bad value on sample:", i, err)
-                    self._values.insert(i, str(err))
+            datatype = self.datatype
+            self._values = SampleList(
+                self.iobject.getValue,
+                self.iobject.getNumSamples(),
+                cache = _sample_cache(self),
+                key = _source_path(self.iobject),
+                itemsize = POD_BYTES.get(datatype.getPod(), 0) * datatype.getExtent()
+            )
+        elif isinstance(self._values, tuple):
+            self._values = []
         return self._values
 
-    def get_value(self, index=None, time=None, frame=None):
+    def get_value(self, index=None, time=None, frame=None, interpolate=False):
         """Returns a the value stored on this property for a given sample
         index, time or frame.
 
         Provide one of the following args. If none are provided, it will
         return the 0th value.
 
+        With interpolate, times and frames between two samples return a
+        blend of the samples instead of the nearest one. Floats, vectors
+        and float arrays are lerped, and matrices are decomposed with the
+        rotation slerped. Other values hold the earlier sample. ::
+
+            >>> p.get_value(frame=1001.5, interpolate=True)
+
         :param index: sample index
         :param time: time in seconds
         :param frame: frame number (assumes 24fps, to change set on archive)
+        :param interpolate: blend the samples around a time or frame
         """
         if self.is_compound():
             raise TypeError(_COMPOUND_PROPERTY_VALUE_ERROR_)
         if index == None and time == None and frame == None:
             index = 0
+        elif index is None and interpolate:
+            sampling = self.__get_sampling()
+            if sampling is not None:
+                return self.__get_interpolated_value(sampling, time, frame)
+            index = self.__get_sample_index(time, frame)
         elif index is None:
             index = self.__get_sample_index(time, frame)
         try:
@@ -1110,6 +3764,108 @@ class Property(object):
             self.values[index] = val
             return val
 
+    def __get_interpolated_value(self, sampling, time=None, frame=None):
+        """Returns the value at a time or frame interpolated between the
+        samples around it.
+        """
+        archive, tsid, num_samples = sampling
+        if time is None:
+            time = frame / float(archive.fps)
+        floor, ceil, alpha = archive.time_sampling_table.bracket(
+            tsid, num_samples, time)
+        values = self.values
+        if not isinstance(values, SampleList) or values.modified:
+            self._bracket = None
+            start, end = values[floor], values[ceil]
+        else:
+            start, end = _read_bracket(self, values.__getitem__, floor, ceil)
+        if alpha == 0:
+            return start
+        return _interpolate_value(start, end, alpha)
+
+    def get_array(self, index=None, time=None, frame=None):
+        """Returns the value stored on this property for a given sample
+        index, time or frame as a NumPy ndarray with the dtype of the
+        property's POD. Array values have the shape (N,) or (N, extent),
+        e.g. (N, 3) for V3f arrays and (N, 4, 4) for M44d arrays.
+
+        Where the imath binding allows it, the ndarray is a read-only view
+        of the sample buffer rather than a copy.
+
+        :param index: sample index
+        :param time: time in seconds
+        :param frame: frame number (assumes 24fps, to change set on archive)
+        """
+        value = self.get_value(index=index, time=time, frame=frame)
+        dtype = None
+        if self.datatype:
+            dtype = NUMPY_DTYPES_BY_POD.get(self.pod())
+        extent = self.extent() if self.datatype else 1
+        return imath_to_numpy(value, dtype, extent)
+
+    def __frame_indices(self, frames=None):
+        """Converts a slice or sequence of frame numbers to sample indices.
+
+        :param frames: slice or sequence of frames, or None for all samples.
+        :return: list of sample indices.
+        """
+        if frames is None:
+            return list(range(len(self.values)))
+        if isinstance(frames, slice):
+            start, stop = frames.start, frames.stop
+            if start is None or stop is None:
+                fps = self.archive().fps
+                ts = self.iobject.getTimeSampling()
+                if start is None:
+                    start = int(round(ts.getSampleTime(0) * fps))
+                if stop is None:
+                    last = max(len(self.values) - 1, 0)
+                    stop = int(round(ts.getSampleTime(last) * fps)) + 1
+            frames = range(start, stop, frames.step or 1)
+        return [self.__get_sample_index(frame=frame) for frame in frames]
+
+    def as_time_array(self, frames=None):
+        """Returns the samples for a number of frames stacked in a single
+        ndarray, with the shape (num_frames,) + the shape of one sample,
+        e.g. (num_frames, N, 3) for P. ::
+
+            >>> p.as_time_array(frames=slice(1001, 1101)).shape
+            (100, 2048, 3)
+
+        Only the requested samples are read, and they are copied straight
+        into the preallocated result. The property must have a constant
+        topology over the frames, otherwise a ValueError is raised.
+
+        :param frames: slice or sequence of frame numbers, or None for
+            every sample.
+        :return: numpy.ndarray
+        """
+        if numpy is None:
+            raise ImportError(_NUMPY_REQUIRED_ERROR_)
+        if self.is_compound():
+            raise TypeError(_COMPOUND_PROPERTY_VALUE_ERROR_)
+        indices = self.__frame_indices(frames)
+        values = self.values
+        read = values.peek if isinstance(values, SampleList) else values.__getitem__
+        dtype = NUMPY_DTYPES_BY_POD.get(self.pod()) if self.datatype else None
+        extent = self.extent() if self.datatype else 1
+        result = None
+        for row, index in enumerate(indices):
+            if row > 0 and index == indices[row - 1]:
+                result[row] = result[row - 1]
+                continue
+            sample = imath_to_numpy(read(index), dtype, extent)
+            if result is None:
+                result = numpy.empty((len(indices),) + sample.shape,
+                                     dtype=sample.dtype)
+            elif sample.shape != result.shape[1:]:
+                raise ValueError("Topology of %s changes at sample %d"
+                                 % (self.name, index))
+            result[row] = sample
+        if result is None:
+            return numpy.empty((0,))
+        return result
+
     def set_value(self, value, index=None, time=None, frame=None):
         """Sets a value on the property at a given index.
 
@@ -1123,8 +3879,9 @@ class Property(object):
         if self.is_compound():
             raise TypeError(_COMPOUND_PROPERTY_VALUE_ERROR_)
         value = _delist(value)
+        self._dirty = True
         if index == None and time == None and frame == None:
-            index = len(self._values)
+            index = len(self.values)
         elif index is None:
             index = self.__get_sample_index(time, frame)
         if index < len(self.values):
@@ -1134,11 +3891,16 @@ class Property(object):
 
     def clear_properties(self):
         """Clears the properties container."""
-        self._prop_dict = DeepDict(self, Property)
+        if self._prop_dict:
+            _metadata_changed(self)
+        self._prop_dict = None
+        self._dirty = True
 
     def clear_values(self):
         """Clears the values container."""
-        self._values = []
+        self._values = ()
+        self._bracket = None
+        self._dirty = True
 
     def close(self):
         """Closes this property by removing references to internal OProperty.
@@ -1149,54 +3911,102 @@ class Property(object):
         self._oobject = None
         self._klass = None
         self._parent = None
-        self._values = []
-        for prop in self.properties.values():
+        self._values = ()
+        for prop in _loaded_values(self._prop_dict):
             prop.close()
 
     def save(self):
         """Walks sub-tree and creates corresponding alembic OProperty classes,
-        if they don't exist, and sets values.
+        if they don't exist, and sets values. Properties that have not been
+        changed are copied from the IProperty as they are.
         """
+        if self.iobject and not self.is_dirty():
+            parent = self._oparent()
+            if parent and not parent.getPropertyHeader(self.name):
+                _copy_iproperty(self.iobject, parent, self.time_sampling_id)
+                return
         if self.oobject and not self.is_compound():
             if self.name in (".selfBnds", ".childBnds"):
                 self.oobject.getMetaData().set("interpretation", "box")
-            for value in self.values:
-                try:
-                    value = python_to_imath(value)
-                    self.oobject.setValue(value)
-                except Exception as err:
-                    print("Error setting value on %s: %s %s\n%s" \
-                        % (self.name, value, self._klass, err))
-                del value
+            if isinstance(self.values, SampleList):
+                self.__copy_values()
+            else:
+                previous = None
+                for value in self.values:
+                    self._write_value(value, previous)
+                    previous = value
+                    del value
+                del previous
         else:
-            for prop in self.properties.values():
-                up = False
-                if not prop.iobject and not prop.object().iobject:
-                    if prop.name == ".childBnds":
-                        prop._oobject = prop.object().oobject.getSchema().getChildBoundsProperty()
-                    elif prop.parent.name == ".userProperties":
-                        up = Property()
-                        up._oobject = prop.object().oobject.getSchema().getUserProperties()
-                        up.properties[prop.name] = prop
-                        prop.parent = up
-                    elif prop.parent.name == ".arbGeomParams":
-                        up = Property()
-                        up._oobject = prop.object().oobject.getSchema().getArbGeomParams()
-                        up.properties[prop.name] = prop
-                        prop.parent = up
-                else:
-                    prop.parent = self
+            for name, prop in list(dict.items(self.properties)):
+                if prop is _UNLOADED and self.oobject:
+                    _copy_iproperty(self.iobject.getProperty(name),
+                                    self.oobject, self.time_sampling_id)
+                    continue
+                prop = self.properties[name]
+                prop.parent = self
                 prop.save()
-                prop.close()
                 del prop
-                if up:
-                    up.close()
-                    del up
-        self.close()
+
+    def __copy_values(self):
+        """Writes the samples of a property read from an archive. Samples
+        that have not been set or read in Python are copied straight from
+        the IProperty to the OProperty, without any conversion, and the
+        samples of constant properties are only read once.
+        """
+        values = self.values
+        iprop = self.iobject
+        oprop = self.oobject
+        set_from_previous = getattr(oprop, "setFromPrevious", None)
+        constant = iprop.isConstant()
+        copied = False
+        previous = None
+        for index in range(len(values)):
+            value = values.stored(index)
+            if value is not None:
+                self._write_value(value, previous)
+                previous = value
+                copied = False
+                continue
+            previous = None
+            try:
+                if copied and constant and set_from_previous:
+                    set_from_previous()
+                else:
+                    oprop.setValue(iprop.getValue(index))
+                copied = True
+            except Exception as err:
+                print("Error copying value on %s: %s %s\n%s" \
+                    % (self.name, index, self._klass, err))
+                copied = False
+
+    def _write_value(self, value, previous=None):
+        """Converts a value and sets it as the next sample on the OProperty.
+        A value equal to the previous value is repeated with setFromPrevious
+        instead, so it is neither converted nor stored again.
+
+        :param value: value to write.
+        :param previous: previous value written, if known.
+        """
+        try:
+            if previous is not None and _samples_equal(value, previous):
+                set_from_previous = getattr(self.oobject, "setFromPrevious", None)
+                if set_from_previous:
+                    set_from_previous()
+                    return
+            value = python_to_imath(value)
+            self.oobject.setValue(value)
+        except Exception as err:
+            print("Error setting value on %s: %s %s\n%s" \
+                % (self.name, value, self._klass, err))
 
 
 class Object(object):
     """Base I/O Object class."""
+    __slots__ = ("id", "_name", "_metadata", "_isamples", "_osamples",
+                 "_iobject", "_typed", "_oobject", "_klass", "_schema",
+                 "_parent", "_path", "_is_animated", "_tsid", "_prop_dict",
+                 "_child_dict", "_bracket", "_dirty")
     _sample_class = None
     def __init__(self, iobject=None, schema=None,
                  time_sampling_id=None, name=None):
@@ -1210,22 +4020,26 @@ class Object(object):
 
         # init some private variables
         self._name = name
-        self._metadata = {}
-        self._isamples = []
-        self._osamples = []
+        self._metadata = None
+        self._isamples = ()
+        self._osamples = ()
         self._iobject = iobject
+        self._typed = False
         self._oobject = None
         self._klass = None
         self._schema = schema
         self._parent = None
+        self._path = None
         self._is_animated = None
         self._tsid = time_sampling_id
-        self._prop_dict = DeepDict(self, Property)
-        self._child_dict = DeepDict(self, Object)
+        self._prop_dict = None
+        self._child_dict = None
+        self._bracket = None
 
         # init some stuff
         self.clear_all()
         self.__read_object()
+        self._dirty = False
 
     def __repr__(self):
         return '<%s "%s">' % (self.__class__.__name__, self.name)
@@ -1247,6 +4061,7 @@ class Object(object):
 
     def __set_iobject(self, iobject):
         self._iobject = iobject
+        self._typed = False
 
     iobject = property(__get_iobject, __set_iobject,
                        doc="Internal Alembic IObject object.")
@@ -1312,10 +4127,14 @@ class Object(object):
         return self._parent
 
     def __set_parent(self, parent):
-        self._parent = parent
         self._oobject = None
         if parent and type(self) != Top:
             parent.add_child(self)
+        else:
+            _hierarchy_changed(self._parent)
+            self._parent = parent
+            _clear_paths(self)
+            _hierarchy_changed(parent)
 
     parent = property(__get_parent, __set_parent,
                       doc="Parent object accessor.")
@@ -1331,10 +4150,16 @@ class Object(object):
     def __set_name(self, name):
         old = self._name
         self._name = name
-        if self.parent and hasattr(self._parent, "_child_dict"):
-            if old and old in self._parent._child_dict:
-                self._parent._child_dict.remove(old)
-                self._parent._child_dict[name] = self
+        if old is not None and old != name:
+            self._dirty = True
+            _clear_paths(self)
+        if self.parent and \
+                getattr(self._parent, "_child_dict", None) is not None and \
+                old and old in self._parent._child_dict:
+            self._parent._child_dict.remove(old)
+            self._parent._child_dict[name] = self
+        elif old is not None and old != name:
+            _hierarchy_changed(self)
 
     name = property(__get_name, __set_name,
                     doc="Set and get the name of the object.")
@@ -1346,22 +4171,26 @@ class Object(object):
 
     def __set_tsid(self, tsid):
         self._tsid = tsid
+        self._dirty = True
 
     time_sampling_id = property(__get_tsid, __set_tsid,
                                 doc="Time sampling ID.")
 
     def __get_metadata(self):
-        if not self._metadata and self.iobject:
-            meta = self.iobject.getMetaData()
-            for field in meta.serialize().split(';'):
-                splits = field.split('=')
-                key = splits[0]
-                value = '='.join(splits[1:])
-                self._metadata[key] = value
+        if not self._metadata:
+            if self.iobject:
+                self._metadata = _Metadata(
+                    self, _metadata_dict(self.iobject.getMetaData()))
+            elif self._metadata is None:
+                self._metadata = _Metadata(self)
         return self._metadata
 
     def __set_metadata(self, metadata):
+        if metadata is not None:
+            metadata = _Metadata(self, metadata)
         self._metadata = metadata
+        self._dirty = True
+        _metadata_changed(self)
 
     metadata = property(__get_metadata, __set_metadata,
                         doc="Metadata as a dict.")
@@ -1375,12 +4204,11 @@ class Object(object):
 
     def path(self):
         """Returns the full path/name of this object."""
-        path = [""]
-        obj = self
-        while obj and obj.type() != "Top":
-            path.insert(1, obj.name)
-            obj = obj.parent
-        return "/".join(path)
+        if self._path is None:
+            parent = self.parent
+            prefix = parent.path().rstrip("/") if parent else ""
+            self._path = prefix + "/" + self.name
+        return self._path
 
     def type(self):
         """Returns the name of the class."""
@@ -1396,40 +4224,72 @@ class Object(object):
     def __read_object(self):
         """reads object, sets name"""
         if self.iobject and type(self) != Top:
-            self.name = self.iobject.getName()
+            self._name = self.iobject.getName()
 
     @property
     def children(self):
-        """Returns children sub-tree accessor. """
+        """Returns children sub-tree accessor. Children are read from the
+        child headers, and each child is only wrapped when it is accessed.
+        """
+        if self._child_dict is None:
+            self._child_dict = DeepDict(self, Object)
         if not self._child_dict.visited and self.iobject:
-            for i in range(self.iobject.getNumChildren()):
-                child = wrap(
-                    iobject = self.iobject.getChild(i),
-                    time_sampling_id = self.time_sampling_id
-                )
-                self._child_dict[child.name] = child
+            iobject = self.iobject
+            archive = self.archive()
+            path_filter = archive._path_filter if archive is not None else None
+            prefix = None
+            if path_filter is not None:
+                prefix = self.path().rstrip("/") + "/"
+            for i in range(iobject.getNumChildren()):
+                name = iobject.getChildHeader(i).getName()
+                if prefix is not None and not path_filter(prefix + name):
+                    continue
+                if name not in self._child_dict:
+                    self._child_dict._add_unloaded(name)
+            self._child_dict.visited = True
         return self._child_dict
 
+    def _wrap_child(self, name):
+        """Wraps the child IObject with a given name."""
+        return wrap(
+            iobject = self.iobject.getChild(name),
+            time_sampling_id = self.time_sampling_id
+        )
+
     @property
     def properties(self):
-        """Properties accessor."""
+        """Properties accessor. Properties are read from the property
+        headers, and each is only wrapped when it is accessed.
+        """
+        if self._prop_dict is None:
+            self._prop_dict = DeepDict(self, Property)
         if not self._prop_dict.visited and self.iobject:
             props = self.iobject.getProperties()
-            for i in range(len(props.propertyheaders)):
-                prop = Property(
-                    iproperty = props.getProperty(i),
-                    time_sampling_id = self.time_sampling_id
-                )
-                self._prop_dict[prop.name] = prop
+            for i in range(props.getNumProperties()):
+                name = props.getPropertyHeader(i).getName()
+                if name not in self._prop_dict:
+                    self._prop_dict._add_unloaded(name)
+            self._prop_dict.visited = True
         return self._prop_dict
 
+    def _wrap_property(self, name):
+        """Wraps the top-level IProperty with a given name."""
+        return Property(
+            iproperty = self.iobject.getProperties().getProperty(name),
+            time_sampling_id = self.time_sampling_id
+        )
+
     @property
     def samples(self):
-        """Returns samples from the Alembic IObject."""
+        """Returns samples from the Alembic IObject as a lazy SampleList."""
         if self.iobject and len(self._isamples) == 0:
-            num_samples = self.schema.getNumSamples()
             schema = self.schema
-            self._isamples = [schema.getValue(i) for i in range(num_samples)]
+            self._isamples = SampleList(
+                schema.getValue,
+                schema.getNumSamples(),
+                cache = _sample_cache(self),
+                key = (self.iobject.getFullName(), "samples")
+            )
         return self._isamples
 
     def set_sample(self, sample, index=None):
@@ -1446,7 +4306,10 @@ class Object(object):
             index = len(self._osamples)
         assert type(sample) == self._sample_class,\
             "Can not set %s on %s object" % (sample.__class__.__name__, self.type())
+        if not self._osamples:
+            self._osamples = []
         self._osamples.insert(index, sample)
+        self._dirty = True
 
     def _set_default_sample(self):
         pass
@@ -1456,6 +4319,24 @@ class Object(object):
         """
         return len(self.children) == 0
 
+    def is_dirty(self):
+        """Returns True if this object is new, or its name, metadata,
+        samples, properties or children, or anything below them, have been
+        changed since it was read.
+        """
+        if self._dirty or not self.iobject:
+            return True
+        if self._metadata and \
+                self._metadata != _metadata_dict(self.iobject.getMetaData()):
+            return True
+        for prop in _loaded_values(self._prop_dict):
+            if prop.is_dirty():
+                return True
+        for child in _loaded_values(self._child_dict):
+            if child.is_dirty():
+                return True
+        return False
+
     def is_animated(self):
         """Returns True if any properties are not constant.
         """
@@ -1521,16 +4402,24 @@ class Object(object):
 
     def clear_properties(self):
         """Clears the internal properties container."""
-        self._prop_dict = DeepDict(self, Property)
+        if self._prop_dict:
+            _metadata_changed(self)
+        self._prop_dict = None
+        self._dirty = True
 
     def clear_samples(self):
         """Clears the internal samples container."""
-        self._isamples = []
-        self._osamples = []
+        self._isamples = ()
+        self._osamples = ()
+        self._bracket = None
+        self._dirty = True
 
     def clear_children(self):
         """Clears the internal children container."""
-        self._child_dict = DeepDict(self, Object)
+        if self._child_dict:
+            _children_cleared(self)
+        self._child_dict = None
+        self._dirty = True
 
     def clear_all(self):
         self.clear_properties()
@@ -1556,31 +4445,43 @@ class Object(object):
         """Walks child and property sub-trees creating OObjects as necessary.
         """
         obj = self.oobject
-        for prop in self.properties.values():
+        oprops = obj.getProperties() if hasattr(obj, "getProperties") else None
+        for name, prop in list(dict.items(self.properties)):
+            if prop is _UNLOADED and oprops is not None and \
+                    not oprops.getPropertyHeader(name):
+                _copy_iproperty(self.iobject.getProperties().getProperty(name),
+                                oprops, self.time_sampling_id)
+                continue
+            prop = self.properties[name]
             prop.save()
-            prop.close()
             del prop
+        del oprops
         if not self._osamples:
             self._set_default_sample()
         # OCameras have no getSchema method, properties written explicitly
         if self.type() == 'Camera' and self.iobject:
             return
         for sample in self._osamples:
-            try:
-                if self.type() == 'Light' \
-                   and type(sample) == alembic.AbcGeom.CameraSample:
-                    obj.getSchema().setCameraSample(sample)
-                else:
-                    obj.getSchema().set(sample)
-            except AttributeError as err:
-                print("Error setting sample on %s: %s\n%s" \
-                    % (self.name, sample, err))
+            self._write_sample(sample)
             del sample
         del obj
 
+    def _write_sample(self, sample):
+        """Sets a sample as the next sample on the OObject schema."""
+        try:
+            if self.type() == 'Light' \
+               and type(sample) == alembic.AbcGeom.CameraSample:
+                self.oobject.getSchema().setCameraSample(sample)
+            else:
+                self.oobject.getSchema().set(sample)
+        except AttributeError as err:
+            print("Error setting sample on %s: %s\n%s" \
+                % (self.name, sample, err))
+
 
 class Top(Object):
     """Alembic Top Object."""
+    __slots__ = ()
     def __init__(self, archive, iobject=None):
         super(Top, self).__init__(iobject)
         self._parent = weakref.proxy(archive)
@@ -1612,17 +4513,99 @@ class Top(Object):
 
 class Xform(Object):
     """Xform I/O Object subclass."""
+    __slots__ = ()
     _sample_class = alembic.AbcGeom.XformSample
     def __init__(self, *args, **kwargs):
         super(Xform, self).__init__(*args, **kwargs)
 
-    def matrix(self, index=0):
+    def matrix(self, index=0, time=None, frame=None, interpolate=False):
         """
-        Returns the xform matrix value for a given index.
+        Returns the xform matrix value for a given index, or for the
+        sample nearest to a time or frame.
+
+        With interpolate, times and frames between two samples return a
+        matrix with the translation and scale lerped and the rotation
+        slerped between the samples. ::
+
+            >>> xform.matrix(frame=1001.5, interpolate=True)
 
         :param index: Sample index.
+        :param time: Time in seconds.
+        :param frame: Frame number.
+        :param interpolate: Blend the samples around a time or frame.
+        """
+        schema = self.schema
+        if time is None and frame is None:
+            return schema.getValue(index).getMatrix()
+        if time is None:
+            archive = self.archive()
+            time = frame / float(archive.fps if archive else 24)
+        ts = schema.getTimeSampling()
+        num_samples = schema.getNumSamples()
+        if not interpolate:
+            index = ts.getNearIndex(float(time), num_samples)
+            return schema.getValue(index).getMatrix()
+        floor, ceil, alpha = _sample_bracket(ts, num_samples, float(time))
+        start, end = _read_bracket(
+            self, lambda i: schema.getValue(i).getMatrix(), floor, ceil)
+        if alpha == 0:
+            return start
+        return _interpolate_matrix(start, end, alpha)
+
+    def matrices(self, frames=None):
+        """
+        Returns the xform matrices of all the samples, or of the samples
+        nearest to a list of frames, as a (N, 4, 4) float64 NumPy array.
+        Each sample is only read once.
+
+        :param frames: List of frame numbers, or None for all samples.
+        """
+        schema = self.schema
+        num_samples = schema.getNumSamples()
+        if frames is None:
+            indices = range(num_samples)
+        else:
+            archive = self.archive()
+            fps = float(archive.fps if archive else 24)
+            time_sampling = schema.getTimeSampling()
+            indices = [time_sampling.getNearIndex(frame / fps, num_samples)
+                       for frame in frames]
+        matrices = imath.M44dArray(len(indices))
+        read = {}
+        for i, index in enumerate(indices):
+            matrix = read.get(index)
+            if matrix is None:
+                matrix = read[index] = schema.getValue(index).getMatrix()
+            matrices[i] = matrix
+        return imath_to_numpy(matrices)
+
+    def channels(self, frames=None):
+        """
+        Returns the translate, rotate and scale channels of all the
+        samples, or of the samples nearest to a list of frames, as a dict
+        of (N, 3) NumPy arrays. Rotations are XYZ euler angles in degrees,
+        like XformSample.getXRotation(). Shear is ignored. ::
+
+            >>> xform.channels()["translate"][:, 1]
+            array([0. , 0.5, 1. ])
+
+        :param frames: List of frame numbers, or None for all samples.
         """
-        return self.schema.getValue(index).getMatrix()
+        matrices = self.matrices(frames)
+        basis = matrices[:, :3, :3]
+        scale = numpy.sqrt((basis ** 2).sum(axis=2))
+        rotation = basis / numpy.where(scale == 0, 1.0, scale)[:, :, None]
+        rotate = numpy.stack([
+            numpy.arctan2(rotation[:, 1, 2], rotation[:, 2, 2]),
+            numpy.arctan2(-rotation[:, 0, 2], numpy.hypot(
+                rotation[:, 0, 0], rotation[:, 0, 1])),
+            numpy.arctan2(rotation[:, 0, 1], rotation[:, 0, 0]),
+        ], axis=1)
+        return {
+            "translate": matrices[:, 3, :3].copy(),
+            "rotate": numpy.degrees(rotate),
+            "scale": scale,
+        }
 
     def set_scale(self, *args):
         """
@@ -1639,6 +4622,7 @@ class Xform(Object):
 
 class PolyMesh(Object):
     """PolyMesh I/O Object subclass."""
+    __slots__ = ()
     _sample_class = alembic.AbcGeom.OPolyMeshSchemaSample
     def __init__(self, *args, **kwargs):
         super(PolyMesh, self).__init__(*args, **kwargs)
@@ -1646,6 +4630,7 @@ class PolyMesh(Object):
 
 class SubD(Object):
     """SubD I/O Object subclass."""
+    __slots__ = ()
     _sample_class = alembic.AbcGeom.OSubDSchemaSample
     def __init__(self, *args, **kwargs):
         super(SubD, self).__init__(*args, **kwargs)
@@ -1653,6 +4638,7 @@ class SubD(Object):
 
 class FaceSet(Object):
     """FaceSet I/O Object subclass."""
+    __slots__ = ()
     _sample_class = alembic.AbcGeom.OFaceSetSchemaSample
     def __init__(self, *args, **kwargs):
         super(FaceSet, self).__init__(*args, **kwargs)
@@ -1660,6 +4646,7 @@ class FaceSet(Object):
 
 class Curve(Object):
     """Curve I/O Object subclass."""
+    __slots__ = ()
     _sample_class = alembic.AbcGeom.OCurvesSchemaSample
     def __init__(self, *args, **kwargs):
         super(Curve, self).__init__(*args, **kwargs)
@@ -1667,6 +4654,7 @@ class Curve(Object):
 
 class Camera(Object):
     """Camera I/O Object subclass."""
+    __slots__ = ()
     _sample_class = alembic.AbcGeom.CameraSample
     def __init__(self, *args, **kwargs):
         super(Camera, self).__init__(*args, **kwargs)
@@ -1677,6 +4665,7 @@ class Camera(Object):
 
 class NuPatch(Object):
     """NuPath I/O Object subclass."""
+    __slots__ = ()
     _sample_class = alembic.AbcGeom.ONuPatchSchemaSample
     def __init__(self, *args, **kwargs):
         super(NuPatch, self).__init__(*args, **kwargs)
@@ -1684,12 +4673,14 @@ class NuPatch(Object):
 
 class Material(Object):
     """Material I/O Object subclass."""
+    __slots__ = ()
     def __init__(self, *args, **kwargs):
         super(Material, self).__init__(*args, **kwargs)
 
 
 class Light(Object):
     """Light I/O Object subclass."""
+    __slots__ = ()
     _sample_class = alembic.AbcGeom.CameraSample
     def __init__(self, *args, **kwargs):
         super(Light, self).__init__(*args, **kwargs)
@@ -1697,6 +4688,7 @@ class Light(Object):
 
 class Points(Object):
     """Points I/O Object subclass."""
+    __slots__ = ()
     _sample_class = alembic.AbcGeom.OPointsSchemaSample
     def __init__(self, *args, **kwargs):
         super(Points, self).__init__(*args, **kwargs)
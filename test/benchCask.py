@@ -0,0 +1,443 @@
+#-******************************************************************************
+#
+# Copyright (c) 2012-2021,
+#  Sony Pictures Imageworks Inc. and
+#  Industrial Light & Magic, a division of Lucasfilm Entertainment Company Ltd.
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+# *       Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+# *       Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+# *       Neither the name of Sony Pictures Imageworks, nor
+# Industrial Light & Magic, nor the names of their contributors may be used
+# to endorse or promote products derived from this software without specific
+# prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#-******************************************************************************
+
+"""
+Cask benchmarks. Run all of them with
+
+    $ python benchCask.py
+
+or a single one by name, e.g.
+
+    $ python benchCask.py python_to_imath
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import array
+import timeit
+import tempfile
+
+import imath
+import alembic
+import cask
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _time(func, repeat=3):
+    """Returns the best time in seconds of calling func()."""
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def _report(name, baseline, timings):
+    """Prints timings relative to a baseline timing."""
+    print("%s:" % name)
+    print("  %-24s %8.4fs" % ("baseline", baseline))
+    for label, seconds in timings:
+        print("  %-24s %8.4fs  %6.1fx" % (label, seconds, baseline / seconds))
+
+
+def bench_python_to_imath(size=1000000):
+    """Converting a list of floats to an imath FloatArray, per element vs.
+    bulk conversion from lists and buffers.
+    """
+    values = [float(i) for i in range(size)]
+
+    def per_element():
+        new_value = imath.FloatArray(len(values))
+        for i, v in enumerate(values):
+            new_value[i] = v
+        return new_value
+
+    timings = [
+        ("list", _time(lambda: cask.python_to_imath(values))),
+        ("array.array", _time(
+            lambda: cask.python_to_imath(array.array("f", values)))),
+    ]
+    if numpy is not None:
+        buf = numpy.array(values, dtype="float32")
+        timings.append(("numpy", _time(lambda: cask.python_to_imath(buf))))
+        points = numpy.zeros((size // 3, 3), dtype="float32")
+        timings.append(("numpy (N, 3)", _time(
+            lambda: cask.python_to_imath(points))))
+    _report("python_to_imath %d floats" % size, _time(per_element), timings)
+
+
+def bench_copy_archive(size=100000, num_samples=100):
+    """Re-writing an archive after editing a single sample, converting
+    every sample in Python vs. copying the untouched samples.
+    """
+    tempdir = tempfile.mkdtemp()
+    source = os.path.join(tempdir, "bench_copy_source.abc")
+    oarch = alembic.Abc.OArchive(source)
+    oprop = alembic.Abc.OV3fArrayProperty(
+        alembic.AbcGeom.OXform(oarch.getTop(), "foo").getProperties(), "P")
+    points = imath.V3fArray(size)
+    for i in range(num_samples):
+        points[0] = imath.V3f(i, 0, 0)
+        oprop.setValue(points)
+    del oprop, oarch
+
+    def write(convert_all):
+        a = cask.Archive(source)
+        p = a.top.children["foo"].properties["P"]
+        if convert_all:
+            p.values[:] = p.values[:]
+        p.values[0] = points
+        a.write_to_file(os.path.join(tempdir, "bench_copy_target.abc"))
+
+    _report("copy archive %d samples of %d points" % (num_samples, size),
+            _time(lambda: write(True)),
+            [("copy untouched", _time(lambda: write(False)))])
+
+
+def _write_hierarchy(filename, width, depth, num_samples=0):
+    """Writes an archive with width Xforms under the first width Xforms of
+    each level, and a mesh and a curve under each of those. With
+    num_samples, the Xforms of the first level are animated with one
+    sample per frame. Returns the archive filepath."""
+    filepath = os.path.join(tempfile.mkdtemp(), filename)
+    oarch = alembic.Abc.OArchive(filepath)
+    tsidx = 0
+    if num_samples:
+        tsidx = oarch.addTimeSampling(
+            alembic.AbcCoreAbstract.TimeSampling(1.0 / 24, 0.0))
+    parents = [oarch.getTop()]
+    for level in range(depth):
+        parents = [
+            alembic.AbcGeom.OXform(parent, "xform%d" % i, tsidx)
+            for parent in parents[:width] for i in range(width)
+        ]
+        if level == 0:
+            for oxform in parents:
+                for i in range(num_samples):
+                    sample = alembic.AbcGeom.XformSample()
+                    sample.setTranslation(imath.V3d(i, 0, 0))
+                    oxform.getSchema().set(sample)
+        for parent in parents[:width]:
+            alembic.AbcGeom.OPolyMesh(parent, "mesh")
+            alembic.AbcGeom.OCurves(parent, "curve")
+        alembic.AbcGeom.OCamera(parents[-1], "camera")
+    return filepath
+
+
+def bench_wrap(width=100, depth=3):
+    """Wrapping every object of a large hierarchy, matching each object
+    against every schema vs. looking the schema up in the dispatch table.
+    """
+    filepath = _write_hierarchy("bench_wrap.abc", width, depth)
+
+    iobjects = []
+    def collect(iobject):
+        for i in range(iobject.getNumChildren()):
+            child = iobject.getChild(i)
+            iobjects.append(child)
+            collect(child)
+    iarch = alembic.Abc.IArchive(filepath)
+    collect(iarch.getTop())
+
+    def match_all(iobject):
+        for cls in cask.Object.__subclasses__():
+            if cls.matches(iobject):
+                return cls(iobject)
+        return cask.Object(iobject)
+
+    _report("wrap %d objects" % len(iobjects),
+            _time(lambda: [match_all(o) for o in iobjects]),
+            [("dispatch table", _time(
+                lambda: [cask.wrap(o) for o in iobjects]))])
+
+
+def bench_find(width=100, depth=3):
+    """Finding the cameras of a large hierarchy, wrapping every object vs.
+    matching types on the object headers.
+    """
+    filepath = _write_hierarchy("bench_find.abc", width, depth)
+
+    def find_all(obj, types):
+        results = [obj] if obj.type() in types else []
+        for child in obj.children.values():
+            results.extend(find_all(child, types))
+        return results
+
+    _report("find cameras",
+            _time(lambda: find_all(cask.Archive(filepath).top, ["Camera"])),
+            [("headers", _time(lambda: cask.find(
+                cask.Archive(filepath).top, types=["Camera"]))),
+             ("headers, limit=1", _time(lambda: cask.find(
+                cask.Archive(filepath).top, types=["Camera"], limit=1))),
+             ("path glob", _time(lambda: cask.find(
+                cask.Archive(filepath).top, path="/*/camera")))])
+
+
+def bench_query(width=100, depth=3, repeat=100):
+    """Repeated type queries on a large hierarchy, walking the headers
+    with find vs. looking the types up in the archive query index.
+    """
+    filepath = _write_hierarchy("bench_query.abc", width, depth)
+    a = cask.Archive(filepath)
+
+    def walk():
+        for i in range(repeat):
+            list(cask.find_iter(a.top, types=["Camera"]))
+
+    def query():
+        for i in range(repeat):
+            a.query_index.query(types=["Camera"])
+
+    _report("%d camera queries" % repeat, _time(walk),
+            [("build query index", _time(lambda: cask.Archive(
+                filepath).query_index, repeat=1)),
+             ("query index", _time(query))])
+
+
+def bench_memory(width=100, depth=2):
+    """Python memory used by wrapping every object and property of a large
+    hierarchy, measured with tracemalloc.
+    """
+    import tracemalloc
+    filepath = _write_hierarchy("bench_memory.abc", width, depth)
+
+    def wrap_all(item, counts):
+        counts[type(item) is cask.Property] += 1
+        for prop in item.properties.values():
+            wrap_all(prop, counts)
+        if type(item) is not cask.Property:
+            for child in item.children.values():
+                wrap_all(child, counts)
+
+    a = cask.Archive(filepath)
+    counts = [0, 0]
+    tracemalloc.start()
+    wrap_all(a.top, counts)
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print("memory %d objects, %d properties:" % tuple(counts))
+    print("  %-24s %8.2fMB" % ("total", size / 1048576.0))
+    print("  %-24s %8.0fB" % ("per item", size / float(sum(counts))))
+    print("  %-24s %8.2fMB" % ("peak", peak / 1048576.0))
+
+
+def bench_view(width=100, depth=3):
+    """Visiting every object of a large hierarchy to count the types,
+    wrapping each object vs. reading it into an ArchiveView.
+    """
+    filepath = _write_hierarchy("bench_view.abc", width, depth)
+
+    def wrap_all():
+        counts = {}
+        stack = [cask.Archive(filepath).top]
+        while stack:
+            obj = stack.pop()
+            counts[obj.type()] = counts.get(obj.type(), 0) + 1
+            stack.extend(obj.children.values())
+        return counts
+
+    def view_all():
+        view = cask.ArchiveView(filepath)
+        counts = {}
+        for code in view.type_codes:
+            name = view.type_names[code]
+            counts[name] = counts.get(name, 0) + 1
+        return counts
+
+    _report("count types", _time(wrap_all),
+            [("ArchiveView", _time(view_all))])
+
+
+def bench_world_matrices(width=100, depth=2, num_frames=10):
+    """World matrices of every object of a large hierarchy over several
+    frames, accumulating the matrices above each object vs.
+    world_matrices(). The first level of Xforms is animated, so the
+    matrices below it are evaluated again on every frame.
+    """
+    filepath = _write_hierarchy("bench_world_matrices.abc", width, depth,
+                                num_samples=num_frames)
+    a = cask.Archive(filepath)
+    b = cask.Archive(filepath)
+    objects = [b.get(path) for path in b.index if path != "/"]
+
+    def global_matrix(obj, frame):
+        world = imath.M44d()
+        while obj is not b.top:
+            if obj.type() == "Xform":
+                world *= obj.matrix(frame=frame)
+            obj = obj.parent
+        return world
+
+    def per_object():
+        for frame in range(num_frames):
+            for obj in objects:
+                global_matrix(obj, frame)
+
+    def batched():
+        for frame in range(num_frames):
+            a.world_matrices(frame=frame)
+
+    _report("world matrices %d objects, %d frames" % (
+            len(objects), num_frames), _time(per_object),
+            [("world_matrices", _time(batched))])
+
+
+def bench_xform_channels(num_samples=10000):
+    """Reading the animation of an Xform, one matrix() call per sample vs.
+    Xform.matrices().
+    """
+    filepath = os.path.join(tempfile.mkdtemp(), "bench_xform_channels.abc")
+    oarch = alembic.Abc.OArchive(filepath)
+    oxform = alembic.AbcGeom.OXform(oarch.getTop(), "xform")
+    for i in range(num_samples):
+        sample = alembic.AbcGeom.XformSample()
+        sample.setTranslation(imath.V3d(i, 0, 0))
+        oxform.getSchema().set(sample)
+    del oxform, oarch
+    a = cask.Archive(filepath)
+    xform = a.top.children["xform"]
+
+    timings = []
+    if numpy is not None:
+        timings = [("matrices", _time(lambda: xform.matrices())),
+                   ("channels", _time(lambda: xform.channels()))]
+    _report("xform %d samples" % num_samples,
+            _time(lambda: [xform.matrix(i) for i in range(num_samples)]),
+            timings)
+
+
+def bench_get_values(num_samples=10000):
+    """Reading a value for every frame of an animated property, one
+    get_value() call per frame vs. get_values().
+    """
+    filepath = os.path.join(tempfile.mkdtemp(), "bench_get_values.abc")
+    oarch = alembic.Abc.OArchive(filepath)
+    oprop = alembic.Abc.OFloatProperty(
+        alembic.AbcGeom.OXform(oarch.getTop(), "xform").getProperties(), "f")
+    for i in range(num_samples):
+        oprop.setValue(float(i))
+    del oprop, oarch
+    a = cask.Archive(filepath)
+    p = a.top.children["xform"].properties["f"]
+    frames = [i * 0.5 for i in range(num_samples)]
+
+    _report("get_values %d frames" % len(frames),
+            _time(lambda: [p.get_value(frame=f) for f in frames]),
+            [("get_values", _time(lambda: p.get_values(frames=frames)))])
+
+
+def bench_interpolate(num_samples=100, size=10000, steps=10):
+    """Sweeping an interpolated time across every frame of an animated
+    array property, reading the two samples around each time vs.
+    get_value(interpolate=True) with the kept bracket.
+    """
+    if numpy is None:
+        return
+    filepath = os.path.join(tempfile.mkdtemp(), "bench_interpolate.abc")
+    oarch = alembic.Abc.OArchive(filepath)
+    oprop = alembic.Abc.OV3fArrayProperty(
+        alembic.AbcGeom.OXform(oarch.getTop(), "xform").getProperties(), "P")
+    points = imath.V3fArray(size)
+    for i in range(num_samples):
+        points[0] = imath.V3f(i, 0, 0)
+        oprop.setValue(points)
+    del oprop, oarch
+    a = cask.Archive(filepath, cache_size=0)
+    p = a.top.children["xform"].properties["P"]
+    iprop = p.iobject
+    ts = iprop.getTimeSampling()
+    times = [i / float(steps) for i in range((num_samples - 1) * steps)]
+
+    def per_time():
+        for time in times:
+            floor = ts.getFloorIndex(time, num_samples)[0]
+            ceil = ts.getCeilIndex(time, num_samples)[0]
+            start = cask.imath_to_numpy(iprop.getValue(floor))
+            end = cask.imath_to_numpy(iprop.getValue(ceil))
+            alpha = time - ts.getSampleTime(floor)
+            cask.python_to_imath(start + (end - start) * alpha)
+
+    _report("interpolate %d times" % len(times), _time(per_time),
+            [("interpolate=True", _time(lambda: [
+                p.get_value(time=time, interpolate=True) for time in times]))])
+
+
+def bench_shutter_samples(width=100, depth=2, num_samples=5):
+    """Finding the motion blur samples of every Xform of a large hierarchy,
+    resolving the sample indices per object vs. shutter_samples().
+    """
+    filepath = os.path.join(tempfile.mkdtemp(), "bench_shutter_samples.abc")
+    oarch = alembic.Abc.OArchive(filepath)
+    parents = [oarch.getTop()]
+    for level in range(depth):
+        parents = [alembic.AbcGeom.OXform(parent, "xform%d" % i)
+                   for parent in parents[:width] for i in range(width)]
+        for parent in parents:
+            for i in range(num_samples):
+                sample = alembic.AbcGeom.XformSample()
+                sample.setTranslation(imath.V3d(i, 0, 0))
+                parent.getSchema().set(sample)
+    del parents, oarch
+    a = cask.Archive(filepath)
+    b = cask.Archive(filepath)
+    xforms = [b.get(path) for path in b.index if path != "/"]
+    start, end = 1.75 / 24.0, 2.25 / 24.0
+
+    def per_object():
+        for xform in xforms:
+            schema = xform.schema
+            ts = schema.getTimeSampling()
+            n = schema.getNumSamples()
+            first = ts.getFloorIndex(start, n)[0]
+            last = ts.getCeilIndex(end, n)[0]
+            [(ts.getSampleTime(i), xform.samples[i].getMatrix())
+             for i in range(first, last + 1)]
+
+    _report("shutter samples %d xforms" % len(xforms), _time(per_object),
+            [("shutter_samples", _time(lambda: a.shutter_samples(2)))])
+
+
+def main(names):
+    benchmarks = sorted(k for k in globals() if k.startswith("bench_"))
+    for name in benchmarks:
+        if not names or name[len("bench_"):] in names:
+            globals()[name]()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
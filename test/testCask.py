@@ -44,6 +44,11 @@ import alembic
 import cask
 import meshData
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 kFacevaryingScope = alembic.AbcGeom.GeometryScope.kFacevaryingScope
 kConstantScope = alembic.AbcGeom.GeometryScope.kConstantScope
 
@@ -181,6 +186,31 @@ def deep_out():
 
     return filename
 
+def xforms_out():
+    filename = os.path.join(TEMPDIR, "cask_test_xforms.abc")
+    if os.path.exists(filename) and cask.is_valid(filename):
+        return filename
+
+    oarch = alembic.Abc.OArchive(filename)
+    parent = alembic.AbcGeom.OXform(oarch.getTop(), "parent")
+    child = alembic.AbcGeom.OXform(parent, "child")
+    alembic.AbcGeom.OPolyMesh(child, "mesh")
+    for i in range(3):
+        sample = alembic.AbcGeom.XformSample()
+        sample.setTranslation(imath.V3d(i, 0, 0))
+        parent.getSchema().set(sample)
+    sample = alembic.AbcGeom.XformSample()
+    sample.setTranslation(imath.V3d(0, 1, 0))
+    child.getSchema().set(sample)
+    spin = alembic.AbcGeom.OXform(oarch.getTop(), "spin")
+    for i in range(2):
+        sample = alembic.AbcGeom.XformSample()
+        sample.setYRotation(30.0 * i)
+        sample.setScale(imath.V3d(2, 2, 2))
+        spin.getSchema().set(sample)
+
+    return filename
+
 class Test1_Write(unittest.TestCase):
     def test_write_basic(self):
         filename = os.path.join(TEMPDIR, "cask_write_basic.abc")
@@ -407,6 +437,108 @@ class Test1_Write(unittest.TestCase):
         a.write_to_file(filename)
         self.assertTrue(os.path.isfile(filename))
 
+    def test_copy_samples(self):
+        filename = os.path.join(TEMPDIR, "cask_copy_samples.abc")
+
+        # edit a single sample, the rest are copied from the source
+        a = cask.Archive(lights_out())
+        params = a.top.children["lightB"].properties["shader/prman.light.params"]
+        params.properties["specular"].set_value(0.5, index=3)
+        self.assertEqual(params.properties["specular"].values.stored(4), None)
+        a.write_to_file(filename)
+        a.close()
+
+        b = cask.Archive(filename)
+        params = b.top.children["lightB"].properties["shader/prman.light.params"]
+        exposure = params.properties["exposure"]
+        specular = params.properties["specular"]
+        self.assertEqual(len(exposure.values), 11)
+        self.assertTrue(exposure.iobject.isConstant())
+        self.assertEqual(list(exposure.values), [1.0] * 11)
+        self.assertEqual(len(specular.values), 11)
+        self.assertAlmostEqual(specular.values[0], 0.1)
+        self.assertAlmostEqual(specular.values[3], 0.5)
+        self.assertAlmostEqual(specular.values[4], 0.4)
+        self.assertAlmostEqual(specular.values[10], 1.0)
+        b.close()
+
+        # meshes are copied with the same samples
+        c = cask.Archive(mesh_out())
+        c.write_to_file(filename)
+        c.close()
+        d = cask.Archive(filename)
+        e = cask.Archive(mesh_out())
+        p1 = d.top.children["meshy"].properties[".geom/P"]
+        p2 = e.top.children["meshy"].properties[".geom/P"]
+        self.assertEqual(len(p1.values), len(p2.values))
+        self.assertEqual(list(p1.values[9]), list(p2.values[9]))
+        d.close()
+        e.close()
+
+    def test_repeated_values(self):
+        filename = os.path.join(TEMPDIR, "cask_repeated_values.abc")
+
+        a = cask.Archive()
+        x = a.top.children["foo"] = cask.Xform()
+        steps = x.properties["steps"] = cask.Property()
+        for value in [1.0, 1.0, 1.0, 2.0, 2.0, 3.0]:
+            steps.set_value(value)
+        points = x.properties["points"] = cask.Property()
+        for i in range(5):
+            points.set_value([imath.V3f(0, 1, 2), imath.V3f(3, 4, 5)])
+        a.write_to_file(filename)
+        a.close()
+
+        # repeats are stored once, but sample counts do not change
+        b = cask.Archive(filename)
+        x = b.top.children["foo"]
+        steps = x.properties["steps"]
+        self.assertEqual(list(steps.values), [1.0, 1.0, 1.0, 2.0, 2.0, 3.0])
+        self.assertFalse(steps.iobject.isConstant())
+        points = x.properties["points"]
+        self.assertEqual(len(points.values), 5)
+        self.assertTrue(points.iobject.isConstant())
+        self.assertEqual(points.values[4][1], imath.V3f(3, 4, 5))
+        b.close()
+
+    def test_save_twice(self):
+        filename_1 = os.path.join(TEMPDIR, "cask_save_twice_1.abc")
+        filename_2 = os.path.join(TEMPDIR, "cask_save_twice_2.abc")
+
+        # nothing has changed after reading
+        a = cask.Archive(mesh_out())
+        meshy = a.top.children["meshy"]
+        self.assertEqual(len(meshy.properties[".geom/P"].values), 10)
+        self.assertFalse(a.is_dirty())
+        self.assertFalse(meshy.is_dirty())
+        a.write_to_file(filename_1)
+
+        # the archive stays usable after saving
+        meshy.name = "meshy2"
+        self.assertTrue(meshy.is_dirty())
+        self.assertTrue(a.is_dirty())
+        self.assertFalse(meshy.properties[".geom/P"].is_dirty())
+        x = a.top.children["foo"] = cask.Xform()
+        x.properties["bar"] = cask.Property()
+        x.properties["bar"].set_value(1.0)
+        self.assertTrue(x.is_dirty())
+        a.write_to_file(filename_2)
+        self.assertEqual(a.top.children["meshy2"], meshy)
+        self.assertEqual(len(meshy.properties[".geom/P"].values), 10)
+        a.close()
+
+        # verify both files
+        b = cask.Archive(filename_1)
+        self.assertEqual(list(b.top.children.keys()), ["meshy"])
+        self.assertEqual(b.top.children["meshy"].type(), "PolyMesh")
+        self.assertEqual(len(b.top.children["meshy"].properties[".geom/P"].values), 10)
+        b.close()
+        c = cask.Archive(filename_2)
+        self.assertEqual(set(c.top.children.keys()), set(["meshy2", "foo"]))
+        self.assertEqual(c.top.children["meshy2"].type(), "PolyMesh")
+        self.assertEqual(c.top.children["foo"].properties["bar"].values[0], 1.0)
+        c.close()
+
     def test_insert_node(self):
         filename = os.path.join(TEMPDIR, "cask_insert_node.abc")
 
@@ -761,6 +893,156 @@ class Test1_Write(unittest.TestCase):
         self.assertEqual(something.pod(), alembic.Util.POD.kInt32POD)
         self.assertEqual(something.extent(), 1)
 
+    def test_write_buffers(self):
+        filename = os.path.join(TEMPDIR, "cask_write_buffers.abc")
+
+        import array
+        a = cask.Archive()
+        foo = a.top.children["foo"] = cask.Xform()
+        floats = foo.properties["floats"] = cask.Property()
+        floats.set_value(array.array("f", [0.5, 1.5, 2.5]))
+        raw = foo.properties["raw"] = cask.Property()
+        raw.set_value(bytearray(b"\x01\x02\x03\x04"))
+        ints = foo.properties["ints"] = cask.Property()
+        ints.set_value(list(range(100)))
+
+        # bulk conversion gives the same result as per-element conversion
+        v = cask.python_to_imath(list(range(100)))
+        self.assertEqual(type(v), imath.IntArray)
+        self.assertEqual(list(v), list(range(100)))
+        v = cask.python_to_imath(array.array("d", [1.0, 2.0]))
+        self.assertEqual(type(v), imath.DoubleArray)
+        self.assertEqual(list(v), [1.0, 2.0])
+
+        # values that do not fit the array type still fail
+        self.assertRaises(TypeError, cask.python_to_imath, [1, 2.5])
+        self.assertRaises((TypeError, OverflowError), cask.python_to_imath,
+                          [1, 2 ** 40])
+
+        if numpy is not None:
+            points = foo.properties["points"] = cask.Property()
+            points.set_value(numpy.arange(12, dtype="float32").reshape(4, 3))
+            v = cask.python_to_imath(numpy.ones((2, 3), dtype="float64"))
+            self.assertEqual(type(v), imath.V3dArray)
+            self.assertEqual(v[1], imath.V3d(1, 1, 1))
+
+        a.write_to_file(filename)
+        a.close()
+
+        # verify pod, extent and values
+        a = cask.Archive(filename)
+        foo = a.top.children["foo"]
+        floats = foo.properties["floats"]
+        self.assertTrue(floats.iobject.isArray())
+        self.assertEqual(floats.pod(), alembic.Util.POD.kFloat32POD)
+        self.assertEqual(list(floats.values[0]), [0.5, 1.5, 2.5])
+        raw = foo.properties["raw"]
+        self.assertEqual(raw.pod(), alembic.Util.POD.kUint8POD)
+        self.assertEqual(list(raw.values[0]), [1, 2, 3, 4])
+        ints = foo.properties["ints"]
+        self.assertEqual(ints.pod(), alembic.Util.POD.kInt32POD)
+        self.assertEqual(list(ints.values[0]), list(range(100)))
+        if numpy is not None:
+            points = foo.properties["points"]
+            self.assertEqual(points.pod(), alembic.Util.POD.kFloat32POD)
+            self.assertEqual(points.extent(), 3)
+            self.assertEqual(points.values[0][3], imath.V3f(9, 10, 11))
+        a.close()
+
+    def test_typed_arrays(self):
+        filename = os.path.join(TEMPDIR, "cask_typed_arrays.abc")
+
+        a = cask.Archive()
+        foo = a.top.children["foo"] = cask.Xform()
+        foo.properties["int8"] = cask.Property()
+        foo.properties["int8"].set_value(cask.Int8Array([-1, 0, 1]))
+        foo.properties["uint16"] = cask.Property()
+        foo.properties["uint16"].set_value(cask.Uint16Array(range(1000)))
+        foo.properties["uint32"] = cask.Property()
+        foo.properties["uint32"].set_value(cask.Uint32Array(b"\x01\x00\x00\x00"))
+        foo.properties["int16"] = cask.Property()
+        foo.properties["int16"].set_value([cask.Int16(1), cask.Int16(-2)])
+
+        # typed arrays convert straight to imath arrays
+        v = cask.python_to_imath(cask.Uint16Array(range(1000)))
+        self.assertEqual(type(v), imath.UnsignedShortArray)
+        self.assertEqual(v[999], 999)
+        self.assertEqual(len(cask.Int64Array([2 ** 40])), 1)
+        self.assertEqual(cask.Int64Array([2 ** 40])[0], 2 ** 40)
+        if numpy is not None:
+            self.assertEqual(list(cask.Uint8Array(numpy.array([1, 255]))),
+                             [1, 255])
+            self.assertRaises(OverflowError, cask.Uint8Array,
+                              numpy.array([300]))
+            self.assertRaises(OverflowError, cask.Int16Array,
+                              numpy.array([1.5]))
+
+        # 64-bit values keep their precision, or fail without 64-bit arrays
+        has_int64 = cask.IMATH_INT64_ARRAY is not None and \
+            cask.IMATH_UINT64_ARRAY is not None
+        if has_int64:
+            foo.properties["int64"] = cask.Property()
+            foo.properties["int64"].set_value(cask.Int64Array([2 ** 53 + 1, -1]))
+            foo.properties["uint64"] = cask.Property()
+            foo.properties["uint64"].set_value(cask.Uint64Array([2 ** 64 - 1]))
+        else:
+            self.assertRaises(TypeError, cask.python_to_imath,
+                              cask.Int64Array([2 ** 53 + 1]))
+
+        a.write_to_file(filename)
+        a.close()
+
+        # verify pod and values
+        a = cask.Archive(filename)
+        foo = a.top.children["foo"]
+        self.assertEqual(foo.properties["int8"].pod(), alembic.Util.POD.kInt8POD)
+        self.assertEqual(list(foo.properties["int8"].values[0]), [-1, 0, 1])
+        self.assertEqual(foo.properties["uint16"].pod(), alembic.Util.POD.kUint16POD)
+        self.assertEqual(foo.properties["uint16"].extent(), 1)
+        self.assertEqual(list(foo.properties["uint16"].values[0]), list(range(1000)))
+        self.assertEqual(foo.properties["uint32"].pod(), alembic.Util.POD.kUint32POD)
+        self.assertEqual(list(foo.properties["uint32"].values[0]), [1])
+        self.assertEqual(foo.properties["int16"].pod(), alembic.Util.POD.kInt16POD)
+        self.assertEqual(list(foo.properties["int16"].values[0]), [1, -2])
+        if has_int64:
+            self.assertEqual(foo.properties["int64"].pod(), alembic.Util.POD.kInt64POD)
+            self.assertEqual(list(foo.properties["int64"].values[0]),
+                             [2 ** 53 + 1, -1])
+            self.assertEqual(foo.properties["uint64"].pod(), alembic.Util.POD.kUint64POD)
+            self.assertEqual(list(foo.properties["uint64"].values[0]),
+                             [2 ** 64 - 1])
+        a.close()
+
+    def test_compact_items(self):
+        x = cask.Xform()
+        p = cask.Property()
+        self.assertRaises(AttributeError, setattr, x, "foo", 1)
+        self.assertRaises(AttributeError, setattr, p, "foo", 1)
+
+        # containers are only created when they are used
+        self.assertTrue(p.is_leaf())
+        self.assertFalse(p.is_compound())
+        self.assertEqual(p._prop_dict, None)
+        self.assertEqual(x._child_dict, None)
+        children = x.children
+        self.assertTrue(x.children is children)
+
+        # values are copied into a tuple once, until the dict changes
+        values = children.values()
+        self.assertEqual(values, ())
+        self.assertTrue(children.values() is values)
+        children["y"] = cask.Xform()
+        self.assertFalse(children.values() is values)
+        self.assertEqual([c.name for c in children.values()], ["y"])
+        children.update(z=cask.Xform())
+        self.assertEqual(sorted(c.name for c in children.values()), ["y", "z"])
+        self.assertTrue(children["z"].parent is x)
+        w = children.setdefault("w", cask.Xform())
+        self.assertTrue(children.setdefault("w", cask.Xform()) is w)
+        self.assertEqual(len(children.values()), 3)
+        del children["y"]
+        self.assertEqual(len(children.values()), 2)
+
     def test_child_bounds(self):
         filename_1 = os.path.join(TEMPDIR, "cask_child_bounds_1.abc")
         filename_2 = os.path.join(TEMPDIR, "cask_child_bounds_2.abc")
@@ -814,6 +1096,43 @@ class Test1_Write(unittest.TestCase):
         self.assertEqual(p.values[0], bounds)
         self.assertEqual(p.metadata.get("interpretation"), "box")
 
+    def test_archive_writer(self):
+        filename = os.path.join(TEMPDIR, "cask_archive_writer.abc")
+
+        # declare the hierarchy once, then stream frames
+        with cask.ArchiveWriter(filename, fps=24, start_frame=1) as writer:
+            x = writer.top.children["foo"] = cask.Xform()
+            age = x.properties[".xform/.userProperties/age"] = cask.Property()
+            tag = x.properties[".xform/.userProperties/tag"] = cask.Property()
+            tag.set_value("static")
+            for frame in range(10):
+                sample = alembic.AbcGeom.XformSample()
+                sample.setTranslation(imath.V3d(frame, 0, 0))
+                values = {"/foo": sample}
+                if frame >= 2:
+                    values["foo/.xform/.userProperties/age"] = float(frame)
+                if frame < 5:
+                    values["foo/.xform/.userProperties/id"] = cask.Int32(7)
+                writer.write_frame(values)
+            self.assertEqual(writer.num_frames, 10)
+            self.assertTrue(writer.is_open())
+
+        # verify samples line up with the time sampling
+        a = cask.Archive(filename)
+        x = a.top.children["foo"]
+        self.assertEqual(a.frame_range(), (1, 10))
+        self.assertEqual(len(x.samples), 10)
+        self.assertEqual(x.samples[3].getTranslation(), imath.V3d(3, 0, 0))
+        props = x.properties[".xform/.userProperties"]
+        self.assertEqual(list(props.properties["age"].values),
+                         [2.0, 2.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0])
+        self.assertEqual(props.properties["id"].pod(), alembic.Util.POD.kInt32POD)
+        self.assertEqual(len(props.properties["id"].values), 10)
+        self.assertEqual(props.properties["id"].values[9], 7)
+        self.assertEqual(list(props.properties["tag"].values), ["static"])
+        self.assertEqual(props.properties["age"].get_value(frame=5), 4.0)
+        a.close()
+
 class Test2_Read(unittest.TestCase):
     def test_verify_write_basic(self):
         filename = os.path.join(TEMPDIR, "cask_write_basic.abc")
@@ -871,12 +1190,310 @@ class Test2_Read(unittest.TestCase):
         self.assertEqual(type(l2.schema), alembic.AbcGeom.ILightSchema)
         self.assertEqual(type(l2.iobject), alembic.AbcGeom.ILight)
 
+        # the typed iobject and schema are only resolved once
+        iobject = l2.iobject
+        self.assertTrue(l2.schema is l2.schema)
+        self.assertTrue(l2.iobject is iobject)
+
     def test_read_mesh(self):
         filepath = mesh_out()
         self.assertTrue(cask.is_valid(filepath))
         a = cask.Archive(filepath)
         t = a.top
 
+    def test_wrap(self):
+        filename = os.path.join(TEMPDIR, "cask_test_wrap.abc")
+        oarch = alembic.Abc.OArchive(filename)
+        top = oarch.getTop()
+        alembic.AbcGeom.OCamera(top, "camera")
+        alembic.AbcGeom.OLight(top, "light")
+        xform = alembic.AbcGeom.OXform(top, "xform")
+        alembic.AbcGeom.OPolyMesh(xform, "mesh")
+        alembic.AbcGeom.OCurves(xform, "curve")
+        alembic.Abc.OObject(xform, "group")
+        del xform, top, oarch
+
+        # same schemas, same classes, whether looked up or matched
+        iarch = alembic.Abc.IArchive(filename)
+        itop = iarch.getTop()
+        ixform = itop.getChild("xform")
+        expected = [
+            (itop.getChild("camera"), cask.Camera),
+            (itop.getChild("light"), cask.Light),
+            (ixform, cask.Xform),
+            (ixform.getChild("mesh"), cask.PolyMesh),
+            (ixform.getChild("curve"), cask.Curve),
+            (ixform.getChild("group"), cask.Object),
+        ]
+        for i in range(2):
+            for iobject, klass in expected:
+                self.assertEqual(type(cask.wrap(iobject)), klass)
+
+    def test_interpolate_values(self):
+        a = cask.Archive(lights_out())
+        p = a.top.children["lightB"].properties["shader/prman.light.params/specular"]
+        ts = p.iobject.getTimeSampling()
+        time = (ts.getSampleTime(2) + ts.getSampleTime(3)) / 2.0
+        self.assertAlmostEqual(p.get_value(time=time, interpolate=True),
+                               (p.values[2] + p.values[3]) / 2.0)
+        self.assertEqual(p.get_value(time=ts.getSampleTime(3),
+                                     interpolate=True), p.values[3])
+        self.assertEqual(p.get_value(time=1000.0, interpolate=True),
+                         p.values[-1])
+
+        # the samples around the last time are kept
+        self.assertEqual(sorted(p._bracket.keys()), [len(p.values) - 1])
+
+        # float arrays are lerped with numpy
+        if numpy is not None:
+            a = cask.Archive(mesh_out())
+            P = a.top.children["meshy"].properties[".geom/P"]
+            ts = P.iobject.getTimeSampling()
+            time = (ts.getSampleTime(0) * 3 + ts.getSampleTime(1)) / 4.0
+            value = P.get_value(time=time, interpolate=True)
+            self.assertEqual(type(value), imath.V3fArray)
+            expected = cask.imath_to_numpy(P.values[0]) * 0.75 + \
+                cask.imath_to_numpy(P.values[1]) * 0.25
+            self.assertTrue(numpy.allclose(cask.imath_to_numpy(value),
+                                           expected))
+
+    def test_lazy_values(self):
+        a = cask.Archive(lights_out())
+        p = a.top.children["lightB"].properties["shader/prman.light.params/specular"]
+
+        # no samples are read until they are accessed
+        values = p.values
+        self.assertEqual(type(values), cask.SampleList)
+        self.assertEqual(len(values), 11)
+        self.assertEqual(len(a.sample_cache), 0)
+
+        # only the accessed samples are read and kept
+        path = p.path()
+        self.assertAlmostEqual(p.get_value(index=3), 0.3)
+        self.assertEqual(len(a.sample_cache), 1)
+        self.assertTrue((path, 3) in a.sample_cache)
+        self.assertEqual(len(values[2:8:2]), 3)
+        self.assertEqual(len(a.sample_cache), 4)
+        self.assertAlmostEqual(values[-1], 1.0)
+
+        # set values override the archive samples
+        p.set_value(2.0, index=4)
+        self.assertAlmostEqual(values[4], 2.0)
+        p.set_value(3.0)
+        self.assertEqual(len(values), 12)
+        self.assertAlmostEqual(values[11], 3.0)
+
+    @unittest.skipIf(numpy is None, "requires numpy")
+    def test_get_array(self):
+        a = cask.Archive(mesh_out())
+        geom = a.top.children["meshy"].properties[".geom"]
+
+        # V3f arrays
+        P = geom.properties["P"].get_array(index=0)
+        self.assertEqual(P.dtype, numpy.float32)
+        self.assertEqual(P.shape, (len(meshData.verts), 3))
+        self.assertEqual(tuple(P[1]), (1.0, -1.0, -1.0))
+        self.assertFalse(P.flags.writeable)
+
+        # int arrays
+        counts = geom.properties[".faceCounts"].get_array(frame=3)
+        self.assertEqual(counts.dtype, numpy.int32)
+        self.assertEqual(list(counts), list(meshData.counts))
+
+        # scalar box values
+        bnds = geom.properties[".selfBnds"].get_array()
+        self.assertEqual(bnds.dtype, numpy.float64)
+        self.assertEqual(bnds.shape, (2, 3))
+
+        # scalar float values
+        a = cask.Archive(lights_out())
+        p = a.top.children["lightB"].properties["shader/prman.light.params/specular"]
+        value = p.get_array(index=3)
+        self.assertEqual(value.shape, ())
+        self.assertAlmostEqual(float(value), 0.3)
+
+        # imath values without a property
+        m = cask.imath_to_numpy(imath.M44d())
+        self.assertEqual(m.shape, (4, 4))
+        self.assertTrue((m == numpy.identity(4)).all())
+        c = cask.imath_to_numpy(imath.Color4c(1, 2, 3, 4), "uint8")
+        self.assertEqual(list(c), [1, 2, 3, 4])
+
+    @unittest.skipIf(numpy is None, "requires numpy")
+    def test_get_array_pods(self):
+        filename = os.path.join(TEMPDIR, "cask_get_array_pods.abc")
+        values = {
+            bool: True,
+            int: 1,
+            float: 1.5,
+            str: "a",
+            imath.V3f: imath.V3f(1, 2, 3),
+            imath.V3d: imath.V3d(1, 2, 3),
+            imath.Color3c: imath.Color3c(1, 2, 3),
+            imath.Color3f: imath.Color3f(1, 2, 3),
+            imath.Color4c: imath.Color4c(1, 2, 3, 4),
+            imath.Color4f: imath.Color4f(1, 2, 3, 4),
+            imath.Box3f: imath.Box3f(imath.V3f(0, 0, 0), imath.V3f(1, 1, 1)),
+            imath.Box3d: imath.Box3d(imath.V3d(0, 0, 0), imath.V3d(1, 1, 1)),
+            imath.M33f: imath.M33f(),
+            imath.M33d: imath.M33d(),
+            imath.M44f: imath.M44f(),
+            imath.M44d: imath.M44d(),
+        }
+        for klass in (cask.Int8, cask.Int16, cask.Int32, cask.Int64,
+                      cask.Uint8, cask.Uint16, cask.Uint32, cask.Uint64):
+            values[klass] = klass(1)
+        for klass in (cask.Int8Array, cask.Int16Array, cask.Int32Array,
+                      cask.Int64Array, cask.Uint8Array, cask.Uint16Array,
+                      cask.Uint32Array, cask.Uint64Array):
+            values[klass] = klass([1, 2])
+        for klass in (imath.StringArray, imath.UnsignedCharArray,
+                      imath.IntArray, imath.V3fArray, imath.V3dArray,
+                      imath.FloatArray, imath.DoubleArray):
+            values[klass] = klass(2)
+        self.assertEqual(set(values), set(cask.POD_EXTENT))
+        if cask.IMATH_INT64_ARRAY is None or cask.IMATH_UINT64_ARRAY is None:
+            del values[cask.Int64Array], values[cask.Uint64Array]
+
+        a = cask.Archive()
+        foo = a.top.children["foo"] = cask.Xform()
+        for klass, value in values.items():
+            foo.properties[klass.__name__] = cask.Property()
+            foo.properties[klass.__name__].set_value(value)
+        a.write_to_file(filename)
+        a.close()
+
+        # every pod reads back with its dtype and number of values
+        a = cask.Archive(filename)
+        foo = a.top.children["foo"]
+        for klass in values:
+            p = foo.properties[klass.__name__]
+            self.assertEqual(p.pod(), cask.POD_EXTENT[klass][0])
+            value = p.get_array()
+            self.assertEqual(value.dtype,
+                             numpy.dtype(cask.NUMPY_DTYPES_BY_POD[p.pod()]))
+            size = numpy.prod(cask.IMATH_SHAPES.get(klass, ()), dtype=int)
+            if klass in cask.IMATH_ARRAYS_VALUES or \
+                    issubclass(klass, cask.TypedArray):
+                size *= 2
+            self.assertEqual(value.size, size, klass.__name__)
+        a.close()
+
+    @unittest.skipIf(numpy is None, "requires numpy")
+    def test_as_time_array(self):
+        a = cask.Archive(lights_out())
+        p = a.top.children["lightB"].properties["shader/prman.light.params/specular"]
+
+        # all samples
+        values = p.as_time_array()
+        self.assertEqual(values.shape, (11,))
+        self.assertEqual(values.dtype, numpy.float32)
+        self.assertAlmostEqual(values[3], 0.3)
+
+        # frame ranges only read the requested samples
+        a.fps = 1
+        values = p.as_time_array(frames=slice(2, 8, 2))
+        self.assertEqual(values.shape, (3,))
+        self.assertAlmostEqual(values[1], 0.4)
+        self.assertEqual(len(a.sample_cache), 0)
+        values = p.as_time_array(frames=[0, 0, 10])
+        self.assertAlmostEqual(values[1], 0.1)
+        self.assertAlmostEqual(values[2], 1.0)
+
+        # array samples
+        a = cask.Archive(mesh_out())
+        P = a.top.children["meshy"].properties[".geom/P"].as_time_array()
+        self.assertEqual(P.shape, (10, len(meshData.verts), 3))
+        self.assertEqual(tuple(P[9][1]), (1.0, -1.0, -1.0))
+
+    def test_sample_cache(self):
+        a = cask.Archive(lights_out(), cache_size=16)
+        l = a.top.children["lightB"]
+        p1 = l.properties["shader/prman.light.params/exposure"]
+        p2 = l.properties["shader/prman.light.params/specular"]
+
+        # float samples are 4 bytes, so the budget holds 4 of them
+        for i in range(6):
+            p1.get_value(index=i)
+        self.assertEqual(len(a.sample_cache), 4)
+        self.assertEqual(a.sample_cache.nbytes, 16)
+        self.assertFalse((p1.path(), 0) in a.sample_cache)
+        self.assertTrue((p1.path(), 5) in a.sample_cache)
+
+        # the cache is shared by all properties of the archive
+        self.assertAlmostEqual(p2.get_value(index=1), 0.1)
+        self.assertTrue((p2.path(), 1) in a.sample_cache)
+        self.assertFalse((p1.path(), 2) in a.sample_cache)
+
+        # evicted samples are read again on access
+        self.assertAlmostEqual(p1.get_value(index=0), 1.0)
+
+        # shrinking the budget evicts immediately
+        a.sample_cache.max_bytes = 4
+        self.assertEqual(len(a.sample_cache), 1)
+
+        a.close()
+        self.assertEqual(len(a.sample_cache), 0)
+
+        # object samples go through the cache too
+        a = cask.Archive(mesh_out())
+        m = a.top.children["meshy"]
+        self.assertEqual(len(m.samples), 10)
+        self.assertEqual(len(a.sample_cache), 0)
+        m.samples[1]
+        self.assertTrue(((m.path(), "samples"), 1) in a.sample_cache)
+        a.close()
+
+    def test_sample_cache_rename(self):
+        a = cask.Archive(lights_out())
+        params = a.top.children["lightB"].properties["shader/prman.light.params"]
+        exposure = params.properties["exposure"]
+        specular = params.properties["specular"]
+        self.assertAlmostEqual(exposure.get_value(index=3), 1.0)
+
+        # a property that replaces a cached one under its name reads its
+        # own samples
+        exposure.name = "old"
+        specular.name = "exposure"
+        self.assertTrue(params.properties["exposure"] is specular)
+        self.assertAlmostEqual(specular.get_value(index=3), 0.4)
+        self.assertAlmostEqual(exposure.get_value(index=3), 1.0)
+
+        # samples stay cached when the object is renamed
+        a.top.children["lightB"].name = "lightC"
+        self.assertEqual(specular.path(),
+                         "/lightC/shader/prman.light.params/exposure")
+        self.assertAlmostEqual(specular.get_value(index=3), 0.4)
+        self.assertTrue(
+            ("/lightB/shader/prman.light.params/specular", 3) in a.sample_cache)
+        a.close()
+
+    def test_get_values(self):
+        a = cask.Archive(lights_out())
+        p = a.top.children["lightB"].properties["shader/prman.light.params/specular"]
+        a.fps = 1
+
+        # the time sampling table is built once per archive
+        table = a.time_sampling_table
+        self.assertTrue(a.time_sampling_table is table)
+        self.assertEqual(len(table), len(a.timesamplings))
+
+        # batched lookups match the per frame lookups
+        frames = [-5, 0, 2.4, 2.5, 2.6, 7, 10, 100]
+        self.assertEqual(p.sample_indices(frames=frames),
+                         [p.iobject.getTimeSampling().getNearIndex(
+                             float(f), p.iobject.getNumSamples())
+                          for f in frames])
+        self.assertEqual(p.get_values(frames=frames),
+                         [p.get_value(frame=f) for f in frames])
+        self.assertEqual(p.get_values(times=[3.0]), [p.get_value(time=3.0)])
+        self.assertEqual(p.get_values(indices=[1, 1]), [p.values[1]] * 2)
+        self.assertEqual(len(p.get_values()), len(p.values))
+
+        # compound properties have no values
+        self.assertRaises(TypeError, p.parent.get_values)
+        a.close()
+
     def test_paths(self):
         filepath = lights_out()
         a = cask.Archive(filepath)
@@ -915,6 +1532,378 @@ class Test2_Read(unittest.TestCase):
         p.parent = x
         self.assertEqual(p.path(), "/x/p")
 
+    def test_lazy_children(self):
+        a = cask.Archive(lights_out())
+
+        # names come from the child headers, nothing is wrapped
+        children = a.top.children
+        self.assertEqual(len(children), 2)
+        self.assertTrue("lightA" in children)
+        self.assertFalse("lightC" in children)
+        self.assertEqual(sorted(children.keys()), ["lightA", "lightB"])
+        self.assertEqual(children.loaded_values(), [])
+        self.assertFalse(a.top.is_leaf())
+
+        # children are wrapped once, when accessed
+        light = children["lightB"]
+        self.assertEqual(light.type(), "Light")
+        self.assertEqual(light.parent, a.top)
+        self.assertEqual(children.loaded_values(), [light])
+        self.assertTrue(children["lightB"] is light)
+        self.assertTrue(children.get("lightB") is light)
+        self.assertEqual(children.get("lightC"), None)
+        self.assertEqual(len(children.values()), 2)
+        self.assertEqual(len(children.loaded_values()), 2)
+        a.close()
+
+    def test_lazy_pop(self):
+        a = cask.Archive(lights_out())
+
+        # copies wrap the children that have not been wrapped yet
+        children = a.top.children
+        self.assertEqual(children.loaded_values(), [])
+        copied = dict(children)
+        self.assertEqual(copied["lightA"].type(), "Light")
+        self.assertEqual(children.copy()["lightB"].type(), "Light")
+
+        # popped children are wrapped, and the parent is marked dirty
+        a = cask.Archive(lights_out())
+        children = a.top.children
+        self.assertFalse(a.is_dirty())
+        light = children.pop("lightA")
+        self.assertEqual(light.type(), "Light")
+        self.assertEqual(light.name, "lightA")
+        self.assertTrue(a.is_dirty())
+        self.assertFalse("lightA" in children)
+        self.assertEqual(children.pop("lightA", None), None)
+        self.assertRaises(KeyError, children.pop, "lightA")
+        name, light = children.popitem()
+        self.assertEqual(name, "lightB")
+        self.assertEqual(light.type(), "Light")
+        self.assertEqual(len(children), 0)
+        self.assertRaises(KeyError, children.popitem)
+        a.close()
+
+    def test_lazy_properties(self):
+        a = cask.Archive(mesh_out())
+        meshy = a.top.children["meshy"]
+
+        # property names come from the property headers
+        self.assertTrue(".geom" in meshy.properties)
+        self.assertEqual(meshy.properties.loaded_values(), [])
+        geom = meshy.properties[".geom"]
+        self.assertEqual(meshy.properties.loaded_values(), [geom])
+        self.assertEqual(len(geom.properties), 7)
+        self.assertTrue("P" in geom.properties)
+        self.assertTrue(".faceIndices" in geom.properties.keys())
+        self.assertEqual(geom.properties.loaded_values(), [])
+        self.assertTrue(geom.is_compound())
+
+        # sub-properties are wrapped once, when accessed
+        p = meshy.properties[".geom/P"]
+        self.assertTrue(geom.properties["P"] is p)
+        self.assertEqual(p.parent, geom)
+        self.assertEqual(p.path(), "/meshy/.geom/P")
+        self.assertEqual(geom.properties.loaded_values(), [p])
+        self.assertEqual(len(p.values), 10)
+        a.close()
+
+    def test_archive_get(self):
+        a = cask.Archive(deep_out())
+
+        # the index is built from headers, without wrapping objects
+        index = a.index
+        self.assertEqual(len(index), 11)
+        self.assertEqual(index["/A/B/C"].header.getName(), "C")
+        self.assertEqual(index["/A/B/C"].item, None)
+        self.assertEqual(a.top._child_dict, None)
+
+        # get only wraps the objects along the path
+        c = a.get("/A/B/C")
+        self.assertEqual(c.name, "C")
+        self.assertEqual(c.type(), "Xform")
+        self.assertEqual(c.path(), "/A/B/C")
+        self.assertEqual(a.index["/A/B/C"].item, c)
+        self.assertTrue(a.get("A/B/C") is c)
+        self.assertTrue(a.top.children["A/B/C"] is c)
+        self.assertTrue(a.get("/") is a.top)
+
+        # property paths
+        p = a.get("/A/B/C/a/b/c/myprop")
+        self.assertEqual(p.path(), "/A/B/C/a/b/c/myprop")
+        self.assertEqual(p.values[0], "foo")
+        self.assertRaises(KeyError, a.get, "/A/B/nothing")
+
+        # opening or editing other archives keeps the index and paths
+        index = a.index
+        b = cask.Archive(deep_out())
+        b.get("/A/B").name = "Y"
+        self.assertTrue(a.index is index)
+        self.assertEqual(c.path(), "/A/B/C")
+        b.close()
+
+        # the index follows renames
+        a.get("/A/B").name = "Z"
+        self.assertEqual(c.path(), "/A/Z/C")
+        self.assertTrue("/A/Z/C" in a.index)
+        self.assertFalse("/A/B/C" in a.index)
+        self.assertTrue(a.get("/A/Z/C") is c)
+
+        # only the entries below a changed object are updated
+        entry = a.index["/A/Z"]
+        c.name = "X"
+        self.assertTrue(a.index["/A/Z"] is entry)
+        self.assertTrue("/A/Z/X/D" in a.index)
+        self.assertFalse("/A/Z/C/D" in a.index)
+        self.assertEqual(len(a.index), 11)
+        del a.get("/A/Z").children["X"]
+        self.assertEqual(sorted(a.index.keys()), ["/", "/A", "/A/Z"])
+        self.assertTrue(a.index["/A/Z"] is entry)
+        a.close()
+
+    def test_world_matrices(self):
+        filename = os.path.join(TEMPDIR, "cask_test_world.abc")
+        oarch = alembic.Abc.OArchive(filename)
+        parent = alembic.AbcGeom.OXform(oarch.getTop(), "parent")
+        child = alembic.AbcGeom.OXform(parent, "child")
+        alembic.AbcGeom.OPolyMesh(child, "mesh")
+        for i in range(3):
+            sample = alembic.AbcGeom.XformSample()
+            sample.setTranslation(imath.V3d(i, 0, 0))
+            parent.getSchema().set(sample)
+        sample = alembic.AbcGeom.XformSample()
+        sample.setTranslation(imath.V3d(0, 1, 0))
+        child.getSchema().set(sample)
+        del sample, child, parent, oarch
+
+        # the default time sampling has one sample per second
+        a = cask.Archive(filename)
+        m = a.world_matrices(time=2)
+        self.assertEqual(list(m.keys()),
+                         ["/parent", "/parent/child", "/parent/child/mesh"])
+        self.assertEqual(m["/parent/child"].translation(), imath.V3d(2, 1, 0))
+        self.assertEqual(m["/parent/child/mesh"], m["/parent/child"])
+        self.assertEqual(m["/parent/child"],
+                         a.get("/parent/child").global_matrix(2))
+        m = a.world_matrices(frame=24)
+        self.assertEqual(m["/parent/child"].translation(), imath.V3d(1, 1, 0))
+        m = a.world_matrices()
+        self.assertEqual(m["/parent/child"].translation(), imath.V3d(0, 1, 0))
+
+        if numpy is not None:
+            paths, array = a.world_matrices(time=1, as_array=True)
+            self.assertEqual(paths, list(m.keys()))
+            self.assertEqual(array.shape, (3, 4, 4))
+            self.assertEqual(list(array[1][3][:3]), [1.0, 1.0, 0.0])
+        a.close()
+
+    def test_shutter_samples(self):
+        a = cask.Archive(xforms_out())
+
+        # the samples around the shutter interval are returned
+        samples = a.shutter_samples(24, -12, 12)
+        self.assertEqual(list(samples.keys()), ["/parent", "/parent/child",
+                                                "/parent/child/mesh", "/spin"])
+        times, values = samples["/parent"]
+        self.assertEqual(times, [0.0, 1.0, 2.0])
+        self.assertEqual([m.translation()[0] for m in values], [0, 1, 2])
+        times, values = samples["/parent/child"]
+        self.assertEqual(len(times), 1)
+        self.assertEqual(values[0].translation(), imath.V3d(0, 1, 0))
+
+        # samples on the shutter open and close need no neighbours
+        samples = a.shutter_samples(24, 0, 24, paths=["/parent", "/spin"])
+        self.assertEqual(list(samples.keys()), ["/parent", "/spin"])
+        self.assertEqual(samples["/parent"][0], [1.0, 2.0])
+        self.assertEqual(samples["/spin"][0], [1.0])
+        self.assertEqual(samples["/parent"][1][0],
+                         a.get("/parent").matrix(1))
+        a.close()
+
+    def test_shutter_samples_unsampled(self):
+        filename = os.path.join(TEMPDIR, "cask_shutter_lights.abc")
+
+        # lights and materials next to an xform
+        a = cask.Archive(lights_out())
+        a.top.children["material"] = cask.Material()
+        xf = a.top.children["xform"] = cask.Xform()
+        samp = alembic.AbcGeom.XformSample()
+        samp.setTranslation(imath.V3d(1.0, 0.0, 0.0))
+        xf.set_sample(samp)
+        a.write_to_file(filename)
+        a.close()
+
+        # objects without samples are skipped
+        a = cask.Archive(filename)
+        samples = a.shutter_samples(1)
+        self.assertEqual(list(samples.keys()), ["/xform"])
+        samples = a.shutter_samples(1, paths=["/material", "/lightA",
+                                              "/xform"])
+        self.assertEqual(list(samples.keys()), ["/xform"])
+        self.assertEqual(samples["/xform"][1][0].translation(),
+                         imath.V3d(1, 0, 0))
+        a.close()
+
+    @unittest.skipIf(numpy is None, "requires numpy")
+    def test_xform_channels(self):
+        a = cask.Archive(xforms_out())
+        parent = a.get("/parent")
+        matrices = parent.matrices()
+        self.assertEqual(matrices.shape, (3, 4, 4))
+        self.assertEqual(list(matrices[:, 3, 0]), [0.0, 1.0, 2.0])
+        self.assertEqual(parent.matrix(2)[3][0], matrices[2][3][0])
+
+        # frames map to the nearest samples
+        matrices = parent.matrices(frames=[0, 48, 49, 1000])
+        self.assertEqual(list(matrices[:, 3, 0]), [0.0, 2.0, 2.0, 2.0])
+
+        # decomposed channels
+        channels = parent.channels()
+        self.assertEqual(list(channels["translate"][:, 0]), [0.0, 1.0, 2.0])
+        self.assertTrue(numpy.allclose(channels["rotate"], 0.0))
+        self.assertTrue(numpy.allclose(channels["scale"], 1.0))
+        channels = a.get("/spin").channels()
+        self.assertTrue(numpy.allclose(channels["rotate"],
+                                       [[0, 0, 0], [0, 30, 0]]))
+        self.assertTrue(numpy.allclose(channels["scale"], 2.0))
+        a.close()
+
+    @unittest.skipIf(numpy is None, "requires numpy")
+    def test_xform_interpolate(self):
+        a = cask.Archive(xforms_out())
+        parent = a.get("/parent")
+        self.assertEqual(parent.matrix(time=0.4), parent.matrix(0))
+        m = parent.matrix(time=0.4, interpolate=True)
+        self.assertTrue(numpy.allclose(m.translation(), (0.4, 0, 0)))
+        m = parent.matrix(frame=36, interpolate=True)
+        self.assertTrue(numpy.allclose(m.translation(), (1.5, 0, 0)))
+        self.assertEqual(parent.matrix(time=5, interpolate=True),
+                         parent.matrix(2))
+
+        # rotations are slerped and scales lerped
+        sample = alembic.AbcGeom.XformSample()
+        sample.setYRotation(15.0)
+        sample.setScale(imath.V3d(2, 2, 2))
+        m = a.get("/spin").matrix(time=0.5, interpolate=True)
+        self.assertTrue(numpy.allclose(cask.imath_to_numpy(m),
+                                       cask.imath_to_numpy(sample.getMatrix())))
+        a.close()
+
+    def test_include_exclude(self):
+        a = cask.Archive(lights_out(), include=["/lightB/**"])
+        self.assertEqual(list(a.top.children.keys()), ["lightB"])
+        self.assertEqual(len(cask.find(a.top, types=["Light"])), 1)
+        self.assertEqual(sorted(a.index.keys()), ["/", "/lightB"])
+        a.close()
+
+        a = cask.Archive(lights_out(), exclude=["/lightB"])
+        self.assertEqual(list(a.top.children.keys()), ["lightA"])
+        self.assertRaises(KeyError, a.get, "/lightB")
+        a.close()
+
+        # excluded sub-trees are not visited, found or written
+        a = cask.Archive(deep_out(), exclude=["/A/B/C/D"])
+        self.assertEqual(len(a.index), 4)
+        self.assertEqual(len(a.query_index.query(types=["Xform"])), 3)
+        self.assertEqual(len(cask.find(a.top, types=["Xform"])), 3)
+        self.assertRaises(KeyError, a.get, "/A/B/C/D")
+        self.assertEqual(len(a.get("/A/B/C").children), 0)
+        filename = os.path.join(TEMPDIR, "cask_test_exclude.abc")
+        a.write_to_file(filename)
+        a.close()
+        b = cask.Archive(filename)
+        self.assertEqual(len(b.index), 4)
+        b.close()
+
+    def test_archive_view(self):
+        view = cask.ArchiveView(deep_out())
+        self.assertEqual(len(view), 11)
+        self.assertEqual(view.name(0), "ABC")
+        self.assertEqual(view.type(0), "Top")
+        self.assertEqual(view.path(0), "/")
+
+        # nodes and paths
+        c = view.node("/A/B/C")
+        self.assertEqual(view.name(c), "C")
+        self.assertEqual(view.type(c), "Xform")
+        self.assertEqual(view.path(c), "/A/B/C")
+        self.assertEqual(view.depths[c], 3)
+        self.assertEqual(view.path(view.parent(c)), "/A/B")
+        self.assertEqual([view.name(n) for n in view.children(c)], ["D"])
+        self.assertRaises(KeyError, view.node, "/A/B/nothing")
+
+        # find
+        self.assertEqual(len(view.find(types=["Xform"])), 10)
+        self.assertEqual(view.find(name="C"), [c])
+        self.assertEqual(len(view.find(path="/A/B/**")), 9)
+        self.assertEqual(len(view.find(types=["Xform"], max_depth=2)), 2)
+        self.assertEqual(len(view.find(limit=3)), 3)
+
+        # values
+        self.assertEqual(view.get_value(c, "a/b/c/myprop"), "foo")
+        self.assertEqual(view.get_value("/A/B/C", "a/b/c/myprop", frame=1),
+                         "foo")
+        self.assertRaises(KeyError, view.get_value, c, "a/b/nothing")
+        self.assertRaises(TypeError, view.get_value, c, "a/b")
+        view.close()
+
+    def test_query(self):
+        filename = os.path.join(TEMPDIR, "cask_test_query.abc")
+        oarch = alembic.Abc.OArchive(filename)
+        top = oarch.getTop()
+        mesh1 = alembic.AbcGeom.OPolyMesh(top, "mesh1")
+        alembic.Abc.OFloatArrayProperty(
+            mesh1.getSchema().getArbGeomParams(), "Cd")
+        alembic.AbcGeom.OPolyMesh(top, "mesh2")
+        meta = alembic.AbcCoreAbstract.MetaData()
+        meta.set("units", "cm")
+        alembic.Abc.OObject(top, "group", meta, 0)
+        del mesh1, top, oarch
+
+        # the index is built from headers, without wrapping objects
+        a = cask.Archive(filename)
+        index = a.query_index
+        self.assertEqual(a.top.children.loaded_values(), [])
+        self.assertEqual(index.query(types=["PolyMesh"]), ["/mesh1", "/mesh2"])
+        self.assertTrue(a.query_index is index)
+
+        # queries
+        r = a.query(types=["PolyMesh"], properties=[".geom/.arbGeomParams/Cd"])
+        self.assertEqual(r, [a.top.children["mesh1"]])
+        self.assertEqual(len(a.query(schema="AbcGeom_PolyMesh_v1")), 2)
+        self.assertEqual(a.query(metadata=["units"]), [a.top.children["group"]])
+        self.assertEqual(len(a.query(metadata={"units": "cm"})), 1)
+        self.assertEqual(len(a.query(metadata={"units": "m"})), 0)
+        self.assertEqual(len(a.query(types=["Xform"])), 0)
+
+        # find uses the index for metadata and property queries
+        r = cask.find(a.top, properties=[".geom/.arbGeomParams/Cd"])
+        self.assertEqual([o.name for o in r], ["mesh1"])
+        r = cask.find(a.top, name="mesh.*", use_index=True)
+        self.assertEqual([o.name for o in r], ["mesh1", "mesh2"])
+
+        # the index follows metadata edits
+        index = a.query_index
+        a.top.children["group"].metadata["units"] = "m"
+        self.assertFalse(a.query_index is index)
+        self.assertEqual(len(a.query(metadata={"units": "cm"})), 0)
+        self.assertEqual(a.query(metadata={"units": "m"}),
+                         [a.top.children["group"]])
+        a.top.children["mesh1"].metadata.update(units="cm")
+        r = cask.find(a.top, metadata={"units": "cm"}, use_index=True)
+        self.assertEqual([o.name for o in r], ["mesh1"])
+        a.top.children["mesh1"].metadata.pop("units")
+        self.assertEqual(a.query(metadata=["units"]), [a.top.children["group"]])
+        a.top.children["group"].metadata = {"units": "cm"}
+        self.assertEqual(len(a.query(metadata={"units": "cm"})), 1)
+        index = a.query_index
+
+        # the index is rebuilt after the hierarchy changes
+        a.top.children["mesh3"] = cask.PolyMesh()
+        self.assertFalse(a.query_index is index)
+        self.assertEqual(len(a.query(types=["PolyMesh"])), 3)
+        a.close()
+
     def test_verify_extract_light(self):
         filename = os.path.join(TEMPDIR, "cask_extract_light.abc")
         self.assertTrue(cask.is_valid(filename))
@@ -1171,6 +2160,28 @@ class Test2_Read(unittest.TestCase):
         
         a.close()
 
+        # only the results and their parents are wrapped
+        a = cask.Archive(filename)
+        r = cask.find(a.top, types=["NuPatch"])
+        self.assertEqual(r[0].path(), "/A/B/C/D/nurby")
+        self.assertEqual(a.top.children.loaded_values(), [a.top.children["A"]])
+
+        # path globs, depth limits and early exit
+        r = cask.find(a.top, name="D", path="/A/foo/**")
+        self.assertEqual(len(r), 1)
+        self.assertEqual(r[0].path(), "/A/foo/C/D")
+        r = cask.find(a.top, path="/A/*/C/D")
+        self.assertEqual(len(r), 2)
+        r = cask.find(a.top, path="/**/nurby")
+        self.assertEqual(len(r), 1)
+        self.assertEqual(len(cask.find(a.top, name="D", max_depth=3)), 0)
+        self.assertEqual(len(cask.find(a.top, name="D", max_depth=4)), 2)
+        self.assertEqual(len(cask.find(a.top, types=["Xform"], limit=3)), 3)
+        r = list(cask.find_iter(a.top, name="D", limit=1))
+        self.assertEqual(len(r), 1)
+        self.assertEqual(r[0].path(), "/A/B/C/D")
+        a.close()
+
 class Test3_Issues(unittest.TestCase):
     def test_issue_318(self):
         """google code issue #318"""